@@ -16,7 +16,7 @@ fileConfig(config.config_file_name)
 from app.db.models import (
     User, Anime, Genre, Character, AnimeSaveList,
     Comment, ViewHistory, AnimeCurrentEpisode,
-    UserFriendList, FriendRequest
+    UserFriendList, FriendRequest, SyncJob
 )
 from app.db.base_models import BaseTable  # Переконайтеся, що цей імпорт правильний
 target_metadata = BaseTable.metadata
@@ -0,0 +1,60 @@
+import fnmatch
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+
+class LocalCache:
+    """Size-bounded in-process LRU cache with per-entry TTL and hit/miss/eviction counters."""
+
+    def __init__(self, max_size: int, max_ttl: int):
+        self.max_size = max_size
+        self.max_ttl = max_ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, ttl: int):
+        self._entries[key] = (time.monotonic() + min(ttl, self.max_ttl), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, *keys: str):
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def delete_pattern(self, pattern: str):
+        for key in [key for key in self._entries if fnmatch.fnmatchcase(key, pattern)]:
+            del self._entries[key]
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+        }
@@ -0,0 +1,306 @@
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.cache.local_cache import LocalCache
+from app.core.config import Settings
+from app.db.redis_connection import redis_client
+from app.utils.json_response import dumps, loads, to_jsonable
+
+logger = logging.getLogger(__name__)
+
+settings = Settings()
+
+CACHE_PREFIX = "cache"
+INVALIDATION_CHANNEL = "cache:invalidate"
+LOCK_PREFIX = "cache-lock"
+
+
+def _normalize(value: Any) -> Any:
+    # Lists of query params are order-insensitive filters (e.g. genre_id=1&genre_id=2)
+    if isinstance(value, (list, tuple, set)):
+        return sorted({str(item) for item in value})
+    return value
+
+
+def make_cache_key(namespace: str, params: dict) -> str:
+    """Key for a namespace (one per endpoint) and its normalized parameters."""
+    normalized = {name: _normalize(value) for name, value in params.items()}
+    digest = hashlib.sha1(json.dumps(normalized, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    return f"{CACHE_PREFIX}:{namespace}:{digest}"
+
+
+class ResponseCache:
+    """Two-tier read-through cache of JSON-encoded service results.
+
+    Reads go to a small in-process LRU first, then to Redis. Deletes and
+    invalidations are broadcast over Redis pub/sub so every web process drops
+    its local copies together. Misses are coalesced (see `get_or_compute`),
+    so an expired hot key is rebuilt once rather than by every request. Redis
+    problems are logged and treated as cache misses, so the cache can never
+    take an endpoint down.
+    """
+
+    def __init__(self):
+        self.local = LocalCache(settings.local_cache_max_entries, settings.local_cache_max_ttl_seconds)
+        self.redis_hits = 0
+        self.redis_misses = 0
+        self.redis_errors = 0
+        self.coalesced = 0
+        self.stale_served = 0
+        self.lock_waits = 0
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._invalidation_hooks: List[Callable[[str], None]] = []
+        self._listener: Optional[asyncio.Task] = None
+
+    async def _read_envelope(self, key: str) -> Optional[dict]:
+        try:
+            raw = await redis_client.get_data(key)
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning(f"Cache read failed for {key}: {e}")
+            return None
+        if raw is None:
+            return None
+        envelope = loads(raw)
+        # Entries written before envelopes were introduced count as misses
+        if not isinstance(envelope, dict) or "value" not in envelope or "expires_at" not in envelope:
+            return None
+        return envelope
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Fresh cached value for `key`, or None."""
+        value = self.local.get(key)
+        if value is not None:
+            return value
+        envelope = await self._read_envelope(key)
+        remaining = envelope["expires_at"] - time.time() if envelope else 0
+        if remaining <= 0:
+            self.redis_misses += 1
+            return None
+        self.redis_hits += 1
+        self.local.set(key, envelope["value"], int(remaining))
+        return envelope["value"]
+
+    async def set(self, key: str, value: Any, ttl: int):
+        """Store `value` as fresh for `ttl` seconds; Redis keeps it `cache_stale_seconds` longer as a stale fallback."""
+        self.local.set(key, value, ttl)
+        envelope = {"value": value, "expires_at": time.time() + ttl}
+        try:
+            await redis_client.set_data(key, dumps(envelope), ttl + settings.cache_stale_seconds)
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning(f"Cache write failed for {key}: {e}")
+
+    async def get_or_compute(self, key: str, ttl: int, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Read-through lookup where concurrent misses for one key share a single computation.
+
+        Inside a process, callers that miss while a computation for the key is
+        in flight await that computation instead of starting their own.
+        """
+        value = self.local.get(key)
+        if value is not None:
+            return value
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(task)
+            except asyncio.CancelledError:
+                # Only recover if the leading request was cancelled, not this one
+                if not task.cancelled():
+                    raise
+            return await self._load(key, ttl, compute)
+
+        task = asyncio.ensure_future(self._load(key, ttl, compute))
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await task
+
+    async def _load(self, key: str, ttl: int, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Cross-process single-flight: one worker rebuilds under a short Redis lock.
+
+        The others serve the stale value if there is one, otherwise wait up
+        to `cache_lock_wait_seconds` for the rebuilt value before computing it
+        themselves.
+        """
+        envelope = await self._read_envelope(key)
+        if envelope is not None and envelope["expires_at"] > time.time():
+            self.redis_hits += 1
+            self.local.set(key, envelope["value"], int(envelope["expires_at"] - time.time()))
+            return envelope["value"]
+        self.redis_misses += 1
+
+        lock_name = f"{LOCK_PREFIX}:{key}"
+        token = uuid.uuid4().hex
+        try:
+            acquired = await redis_client.acquire_lock(lock_name, token, settings.cache_lock_timeout_ms)
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning(f"Cache lock failed for {key}: {e}")
+            acquired = True
+
+        if not acquired:
+            if envelope is not None:
+                self.stale_served += 1
+                return envelope["value"]
+            self.lock_waits += 1
+            deadline = time.monotonic() + settings.cache_lock_wait_seconds
+            while time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+                envelope = await self._read_envelope(key)
+                if envelope is not None:
+                    return envelope["value"]
+
+        try:
+            value = await compute()
+            await self.set(key, value, ttl)
+            return value
+        finally:
+            if acquired:
+                try:
+                    await redis_client.release_lock(lock_name, token)
+                except Exception as e:
+                    logger.warning(f"Cache lock release failed for {key}: {e}")
+
+    async def delete(self, *keys: str):
+        if not keys:
+            return
+        self.local.delete(*keys)
+        try:
+            await redis_client.delete_data(*keys)
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning(f"Cache delete failed: {e}")
+        await self._broadcast({"keys": list(keys)})
+
+    async def invalidate(self, *namespaces: str):
+        """Drop every cached entry of the given namespaces (glob patterns allowed, e.g. "anime:*")."""
+        for namespace in namespaces:
+            self._drop_local_namespace(namespace)
+            try:
+                await redis_client.delete_by_pattern(f"{CACHE_PREFIX}:{namespace}:*")
+            except Exception as e:
+                self.redis_errors += 1
+                logger.warning(f"Cache invalidation failed for {namespace}: {e}")
+        await self._broadcast({"namespaces": list(namespaces)})
+
+    def on_invalidate(self, hook: Callable[[str], None]):
+        """Register a callback run with each invalidated namespace pattern, in every process.
+
+        Lets in-memory structures derived from cached data (registries, indexes)
+        follow the same invalidations as the cache itself.
+        """
+        self._invalidation_hooks.append(hook)
+
+    def _drop_local_namespace(self, namespace: str):
+        self.local.delete_pattern(f"{CACHE_PREFIX}:{namespace}:*")
+        for hook in self._invalidation_hooks:
+            try:
+                hook(namespace)
+            except Exception as e:
+                logger.warning(f"Invalidation hook failed for {namespace}: {e}")
+
+    async def _broadcast(self, message: dict):
+        try:
+            await redis_client.publish(INVALIDATION_CHANNEL, json.dumps(message))
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning(f"Cache invalidation broadcast failed: {e}")
+
+    def _apply_invalidation(self, raw: Any):
+        message = json.loads(raw)
+        self.local.delete(*message.get("keys", []))
+        for namespace in message.get("namespaces", []):
+            self._drop_local_namespace(namespace)
+
+    async def _listen(self):
+        while True:
+            pubsub = None
+            try:
+                pubsub = await redis_client.pubsub()
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                # Anything published while we were not subscribed is lost
+                self.local.clear()
+                logger.info("📡 Підписка на інвалідацію кешу активна")
+                while True:
+                    # A bounded wait keeps the read under the pool's socket timeout
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message is not None:
+                        self._apply_invalidation(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Cache invalidation listener error, reconnecting: {e}")
+                await asyncio.sleep(5)
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+
+    def start_listener(self):
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop_listener(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    def stats(self) -> dict:
+        return {
+            "local": self.local.stats(),
+            "redis": {
+                "hits": self.redis_hits,
+                "misses": self.redis_misses,
+                "errors": self.redis_errors,
+            },
+            "single_flight": {
+                "coalesced": self.coalesced,
+                "stale_served": self.stale_served,
+                "lock_waits": self.lock_waits,
+                "in_flight": len(self._inflight),
+            },
+        }
+
+
+response_cache = ResponseCache()
+
+
+def cached(namespace: str, ttl: int):
+    """Cache an async service method's result under `namespace`, keyed on its arguments.
+
+    The result is stored JSON-encoded, so cached and fresh calls both return
+    plain JSON data; the conversion goes through the same orjson encoder as
+    FastJSONResponse. Exceptions (e.g. HTTPException 404) are not cached.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            params = {name: value for name, value in bound.arguments.items() if name != "self"}
+            key = make_cache_key(namespace, params)
+
+            async def compute():
+                return to_jsonable(await func(*args, **kwargs))
+
+            return await response_cache.get_or_compute(key, ttl, compute)
+
+        return wrapper
+    return decorator
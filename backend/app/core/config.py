@@ -13,6 +13,9 @@ class Settings(BaseSettings):
     
     redis_host: str
     redis_port: int
+    redis_max_connections: int = 50
+    redis_socket_timeout: float = 5.0
+    redis_health_check_interval: int = 30
     
     secret_key: str
     jwt_algorithm: str
@@ -21,5 +24,49 @@ class Settings(BaseSettings):
     refresh_token_expire_days_long: int
     api_token: str
 
+    # Shikimori ingestion
+    shikimori_rate_limit: float = 1.5  # requests per second (Shikimori allows 90 rpm)
+    shikimori_rate_burst: int = 5
+    shikimori_concurrency: int = 4
+    shikimori_timeout: float = 30.0
+    shikimori_max_retries: int = 4
+    shikimori_retry_backoff: float = 1.0  # seconds, doubled on every retry
+    ingestion_queue_size: int = 10
+    ingestion_batch_pages: int = 5  # pages per bulk upsert transaction
+    anime_max_pages: int = 2500
+    anime_delta_sync_minutes: int = 30
+    anime_full_sync_hours: int = 24
+    anime_delta_sync_profile: str = "light"  # Shikimori field profile, see shikimori_queries
+    anime_full_sync_profile: str = "full"
+    genre_registry_ttl_seconds: int = 600
+    character_max_pages: int = 1000
+    character_sync_hours: int = 168
+    character_backfill_minutes: int = 60
+    character_backfill_max_failures: int = 3  # after this many failed fetches an id is skipped...
+    character_backfill_retry_days: int = 30  # ...until its last failure is this old
+    sync_queue_poll_seconds: int = 10  # how often the worker picks up manually queued syncs
+
+    # News feed cache
+    news_refresh_minutes: int = 15
+    news_cache_ttl_seconds: int = 86400  # how long a stale snapshot may still be served
+    news_local_ttl_seconds: int = 30  # how long a worker trusts its in-process copy before re-reading Redis
+
+    # Response cache TTLs (seconds)
+    cache_ttl_anime_list: int = 300
+    cache_ttl_anime_detail: int = 600
+    cache_ttl_anime_dictionaries: int = 3600
+    cache_ttl_latest_comments: int = 30
+    cache_ttl_count: int = 600
+    cache_ttl_anime_search: int = 120
+    facet_index_ttl_seconds: int = 3600
+    suggest_index_ttl_seconds: int = 3600
+    suggest_top_k: int = 10
+    suggest_precomputed_prefix_length: int = 3
+    local_cache_max_entries: int = 2048
+    local_cache_max_ttl_seconds: int = 60  # bounds staleness if an invalidation message is missed
+    cache_stale_seconds: int = 120  # how long an expired entry may still be served while it is rebuilt
+    cache_lock_timeout_ms: int = 5000
+    cache_lock_wait_seconds: float = 2.0
+
     class Config:
         env_file = ".env"
@@ -1,8 +1,8 @@
-from sqlalchemy import Column, Integer, String , Text, Date, Boolean , Float, DateTime, func
-from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy import Column, Integer, String , Text, Date, Boolean , Float, DateTime, func, Index, text, Computed
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR, JSONB
 from app.db.base_models import BaseTable
 from sqlalchemy import Table, Column, String, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 import uuid
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy import Enum
@@ -11,6 +11,12 @@ import datetime
 
 
 # genre_ids = Column(ARRAY(Integer))
+
+# Year the anime aired; falls back to the year of `season` ("fall_2020") when aired_on is unknown
+ANIME_AIRED_YEAR_SQL = (
+    "COALESCE(CAST(EXTRACT(year FROM aired_on) AS INTEGER), "
+    "CAST(substring(season from '([0-9]{4})$') AS INTEGER))"
+)
 class UserStatusEnum(Enum):
     USER = "user"
     ADMIN = "admin"
@@ -33,6 +39,9 @@ class User(BaseTable):
     user_avatar = Column(String, index=True, nullable=True)
     user_banner = Column(String, index=True, nullable=True)
     status = Column(user_status_enum, index=True, nullable=True)
+    __table_args__ = (
+        Index('ix_users_username_trgm', 'username', postgresql_using='gin', postgresql_ops={'username': 'gin_trgm_ops'}),
+    )
     user_comments = relationship('Comment', back_populates='user', cascade='all, delete-orphan')
     
     user_view_history = relationship('ViewHistory', back_populates='user', cascade='all, delete-orphan')
@@ -66,10 +75,32 @@ class Anime(BaseTable):
     related_anime_ids = Column(ARRAY(Text), nullable=True)
     related_anime_texts = Column(ARRAY(Text), nullable=True)
     character_ids = Column(ARRAY(Text), nullable=True)
+    aired_year = Column(Integer, Computed(ANIME_AIRED_YEAR_SQL, persisted=True), nullable=True)
+    japanese = Column(String, nullable=True)
+    synonyms = Column(ARRAY(Text), nullable=True)
+    # Search columns: english/russian/japanese/synonyms in one string (filled on save) and its tsvector.
+    # Deferred so they stay out of API responses.
+    search_text = deferred(Column(Text, nullable=True))
+    search_vector = deferred(Column(TSVECTOR, Computed("to_tsvector('simple', coalesce(search_text, ''))", persisted=True)))
     
     comments = relationship('Comment', back_populates='anime', cascade='all, delete-orphan')
     current_episodes = relationship('AnimeCurrentEpisode', back_populates='anime', cascade='all, delete-orphan')
     # genres = relationship('Genre', secondary=anime_genre, back_populates='animes')
+
+    # Composite indexes matching the keyset pagination orderings (sort key, id)
+    __table_args__ = (
+        Index('ix_anime_kind_score_id', 'kind', text('score DESC NULLS LAST'), text('id DESC NULLS LAST')),
+        Index('ix_anime_rating_score_id', 'rating', text('score DESC NULLS LAST'), text('id DESC NULLS LAST')),
+        Index('ix_anime_status_score_id', 'status', text('score DESC NULLS LAST'), text('id DESC NULLS LAST')),
+        Index('ix_anime_score_id', text('score DESC NULLS LAST'), text('id DESC NULLS LAST')),
+        Index('ix_anime_aired_on_id', text('aired_on DESC NULLS LAST'), text('id DESC NULLS LAST')),
+        Index('ix_anime_aired_year_id', 'aired_year', 'id'),
+        # genre_ids @> ARRAY[...] filters
+        Index('ix_anime_genre_ids_gin', 'genre_ids', postgresql_using='gin'),
+        # Name search: trigram similarity / substring on search_text, prefix full-text on search_vector
+        Index('ix_anime_search_text_trgm', 'search_text', postgresql_using='gin', postgresql_ops={'search_text': 'gin_trgm_ops'}),
+        Index('ix_anime_search_vector', 'search_vector', postgresql_using='gin'),
+    )
     
     
 class Genre(BaseTable):
@@ -89,6 +120,22 @@ class Character(BaseTable):
     japanese = Column(String, index=True, nullable=True)
     poster_url = Column(String, index=True, nullable=False) # original
     description = Column(Text, nullable=True)
+
+    # Name search (substring and trigram similarity)
+    __table_args__ = (
+        Index('ix_character_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+        Index('ix_character_russian_trgm', 'russian', postgresql_using='gin', postgresql_ops={'russian': 'gin_trgm_ops'}),
+        Index('ix_character_japanese_trgm', 'japanese', postgresql_using='gin', postgresql_ops={'japanese': 'gin_trgm_ops'}),
+    )
+
+
+class CharacterFetchFailure(BaseTable):
+    __tablename__ = 'character_fetch_failure'
+    # Referenced character the backfill could not store: Shikimori didn't return it or it lacks required fields
+    character_id = Column(String, index=True, unique=True, nullable=False)
+    failures = Column(Integer, nullable=False, default=1)
+    reason = Column(Text, nullable=True)
+    last_failed_at = Column(DateTime, server_default=func.now(), nullable=False)
     
 class AnimeSaveList(BaseTable):
     __tablename__ = 'anime_save_list'
@@ -155,4 +202,21 @@ class FriendRequest(BaseTable):
     
 
     
-    
\ No newline at end of file
+    
+
+class SyncJob(BaseTable):
+    __tablename__ = 'sync_job'
+    kind = Column(String, index=True, nullable=False)  # e.g. "anime_full"
+    status = Column(String, index=True, nullable=False)  # queued / running / completed / failed
+    last_page = Column(Integer, nullable=False, default=0)  # every page up to this one is done
+    total_pages = Column(Integer, nullable=True)
+    resume_page = Column(Integer, nullable=False, default=1)  # page the current run started from
+    items_saved = Column(Integer, nullable=False, default=0)
+    error_count = Column(Integer, nullable=False, default=0)
+    failed_pages = Column(ARRAY(Integer), nullable=True)
+    last_error = Column(Text, nullable=True)
+    params = Column(JSONB, nullable=True)  # options of a manually queued run, e.g. {"bulk": true, "profile": "full"}
+    started_at = Column(DateTime, server_default=func.now(), nullable=False)
+    resumed_at = Column(DateTime, server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
+    finished_at = Column(DateTime, nullable=True)
@@ -1,86 +1,121 @@
-import asyncio
+import logging
+from typing import Optional
+
+from redis.asyncio import ConnectionPool, Redis
+
 from app.core.config import Settings
-import aioredis
 
 
 settings = Settings()
+logger = logging.getLogger(__name__)
+
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
 
 
 class RedisClient:
+    """App-lifetime Redis client over one shared connection pool.
+
+    `connect()` is called on startup and `close()` on shutdown; helpers also
+    connect lazily so scripts and the worker can use the client directly.
+    """
+
     def __init__(self):
-        self._redis = None
+        self._pool: Optional[ConnectionPool] = None
+        self._redis: Optional[Redis] = None
 
     async def connect(self):
-        self._redis = await aioredis.from_url(f'redis://{settings.redis_host}:{settings.redis_port}')
+        if self._redis is not None:
+            return
+        self._pool = ConnectionPool.from_url(
+            f'redis://{settings.redis_host}:{settings.redis_port}',
+            max_connections=settings.redis_max_connections,
+            socket_timeout=settings.redis_socket_timeout,
+            socket_connect_timeout=settings.redis_socket_timeout,
+            health_check_interval=settings.redis_health_check_interval,
+        )
+        self._redis = Redis(connection_pool=self._pool)
 
     async def close(self):
-        if self._redis:
-            self._redis.close()
-            await self._redis.wait_closed()
-
-    async def get_redis(self):
-        if not self._redis:
+        if self._redis is not None:
+            await self._redis.aclose()
+            await self._pool.disconnect()
+            self._redis = None
+            self._pool = None
+
+    async def get_redis(self) -> Redis:
+        if self._redis is None:
             await self.connect()
         return self._redis
-    
-    async def get_data(self, key):
+
+    async def ping(self) -> bool:
         redis = await self.get_redis()
-        data = await redis.get(key)
-        return data
-    
-    async def set_data(self, key, value,expire_time=172800):
+        return await redis.ping()
+
+    async def get_data(self, key):
         redis = await self.get_redis()
-        await redis.set(key, value)
-        await redis.expire(key, expire_time)
+        return await redis.get(key)
 
+    async def set_data(self, key, value, expire_time=172800):
+        redis = await self.get_redis()
+        await redis.set(key, value, ex=expire_time)
 
     async def scan_iter(self, match_pattern):
         redis = await self.get_redis()
-        cursor = '0'
-        while cursor != 0:
-            cursor, keys = await redis.scan(cursor, match=match_pattern)
-            for key in keys:
-                yield key
+        async for key in redis.scan_iter(match=match_pattern, count=500):
+            yield key
 
+    async def delete_data(self, *keys):
+        redis = await self.get_redis()
+        await redis.delete(*keys)
 
-    async def scan_iter(self, match_pattern):
+    async def delete_by_pattern(self, match_pattern):
+        keys = [key async for key in self.scan_iter(match_pattern)]
+        if keys:
+            await self.delete_data(*keys)
+
+    async def acquire_lock(self, name, token, ttl_ms) -> bool:
+        """SET NX PX: True if this caller now holds the lock."""
+        redis = await self.get_redis()
+        return bool(await redis.set(name, token, nx=True, px=ttl_ms))
+
+    async def release_lock(self, name, token):
+        """Delete the lock only if it still holds our token."""
+        redis = await self.get_redis()
+        await redis.eval(RELEASE_LOCK_SCRIPT, 1, name, token)
+
+    async def publish(self, channel, message):
+        redis = await self.get_redis()
+        await redis.publish(channel, message)
+
+    async def pubsub(self):
         redis = await self.get_redis()
-        cursor = '0'
-        while cursor != 0:
-            cursor, keys = await redis.scan(cursor, match=match_pattern)
-            for key in keys:
-                yield key
+        return redis.pubsub()
+
+
+# Shared client for the whole process
+redis_client = RedisClient()
 
 
 async def check_redis_connection():
-    Redis_client = RedisClient()
-    await Redis_client.connect()
-    redis = await Redis_client.get_redis()
-    if redis:
+    if await redis_client.ping():
         return f"Connected to Redis server"
 
 # Cheking if redis works
 
 
 async def store_data_in_redis():
-    Redis_client = RedisClient()
-    await Redis_client.connect()
-    redis = await Redis_client.get_redis()
-
-    if redis:
-        await redis.set('check', '111')
-        print("Data stored")
+    await redis_client.set_data('check', '111')
+    logger.debug("Redis check value stored")
 
 
 async def retrieve_data_from_redis():
-    Redis_client = RedisClient()
-    await Redis_client.connect()
-    redis = await Redis_client.get_redis()
-
-    if redis:
-        data = await redis.get('check')
-        if data:
-            print(f"Data from Redis: {data.decode('utf-8')}")
-        else:
-            print("Not found")
-
+    data = await redis_client.get_data('check')
+    if data:
+        logger.debug(f"Redis check value: {data.decode('utf-8')}")
+    else:
+        logger.debug("Redis check value not found")
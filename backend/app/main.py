@@ -10,6 +10,7 @@ from .routers.comment_router import comment_router
 from .routers.viewhistory_router import viewhistory_router
 from .routers.user_friends_router import user_friends_router
 from .routers.news_router import news_router
+from .routers.sync_router import sync_router
 import uvicorn
 from .core.config import Settings
 from app.db.postgresql_connection import async_session
@@ -18,10 +19,11 @@ from fastapi.staticfiles import StaticFiles
 from app.repositories.anime_repository import AnimeRepository
 from app.repositories.genre_repository import GenreRepository
 from app.db.postgresql_connection import get_session
-from app.scheduler.scheduler import start_scheduler
-from app.db.postgresql_connection import async_session_worker
 from fastapi import FastAPI
 from app.services.anime_service import AnimeService
+from app.services.shikimori_client import shikimori_client
+from app.cache.response_cache import response_cache
+from app.db.redis_connection import redis_client
 import asyncio
 
 
@@ -39,6 +41,7 @@ app.include_router(comment_router, prefix="/comment", tags=["Comment"])
 app.include_router(viewhistory_router, prefix="/viewhistory", tags=["ViewHistory"])
 app.include_router(user_friends_router, prefix="/user_friendlist", tags=["FriendList"])
 app.include_router(news_router, prefix="/news", tags=["News"])
+app.include_router(sync_router, prefix="/sync", tags=["Sync"])
 
 app.add_middleware(
     CORSMiddleware,
@@ -48,13 +51,17 @@ app.add_middleware(
     allow_headers=["*"] 
 )
 
+# Синхронізація з Shikimori працює в окремому процесі: python -m app.worker
 @app.on_event("startup")
 async def startup_event():
-    async def scheduler_runner():
-        async with async_session_worker() as db:
-            anime_service = AnimeService(db)
-            start_scheduler(anime_service)
-    asyncio.create_task(scheduler_runner())
+    await redis_client.connect()
+    response_cache.start_listener()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await response_cache.stop_listener()
+    await redis_client.close()
+    await shikimori_client.close()
 
 if __name__ == "__main__":
     uvicorn.run("app.main:app", host=settings.host, port=settings.port, reload=settings.debug)
\ No newline at end of file
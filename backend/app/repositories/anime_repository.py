@@ -13,11 +13,64 @@ from sqlalchemy import select, desc, asc, func, Integer
 from sqlalchemy.exc import SQLAlchemyError
 from dateutil import parser
 from sqlalchemy import select, or_ , func ,case, extract
-from sqlalchemy.sql import text
+from sqlalchemy.sql import text, literal_column
+from fastapi import HTTPException
 from uuid import UUID
 from sqlalchemy.dialects.postgresql import insert
+from typing import Optional
+from app.utils.pagination import fetch_keyset_page, count_rows
+import re
+import time
 
 
+# Columns that are NOT NULL on Anime; rows missing them can't be upserted
+ANIME_REQUIRED_FIELDS = ["anime_id", "english", "russian", "kind", "status", "episodes", "poster_url"]
+# Columns an upsert must not overwrite on existing rows
+ANIME_UPSERT_KEEP_FIELDS = {"anime_id", "createdAt"}
+# Namespace of cached totals (count="cached"); dropped with the rest of "anime:*" after a sync
+ANIME_COUNT_CACHE = "anime:count"
+# Default listing order: best rated first (ix_anime_score_id and the per-kind/rating/status
+# indexes); the id tiebreaker makes every ordering total so cursors are exact
+ANIME_DEFAULT_SORT = [(Anime.score, True), (Anime.id, True)]
+ANIME_DEFAULT_SORT_SIGNATURE = "score:desc,id:desc"
+ANIME_YEAR_SORT = [(Anime.aired_year, False), (Anime.id, False)]
+# Column sets for list endpoints (`fields=`); anything else is a comma-separated list of columns and presets.
+# "card" is what the frontend's AnimeCard and its tooltip render; "full" is the whole row.
+ANIME_FIELD_PRESETS = {
+    "minimal": ["anime_id", "english", "russian", "poster_url", "score", "kind"],
+    "card": ["anime_id", "english", "russian", "poster_url", "score", "kind", "rating", "status", "episodes", "aired_on", "genre_ids", "description"],
+}
+# Internal columns that are never returned
+ANIME_HIDDEN_FIELDS = {"search_text", "search_vector"}
+
+
+def anime_columns(fields: str = "card") -> list:
+    """Columns to select for `fields`; `id` is always included. 400 on unknown column names."""
+    if fields == "full":
+        names = [column.key for column in Anime.__table__.columns if column.key not in ANIME_HIDDEN_FIELDS]
+    else:
+        # Presets may be combined with extra columns: "card,character_ids"
+        names = [name for part in fields.split(",") for name in ANIME_FIELD_PRESETS.get(part.strip(), [part.strip()]) if name]
+    unknown = [name for name in names if name not in Anime.__table__.columns or name in ANIME_HIDDEN_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown anime fields: {unknown}")
+    return [Anime.id] + [getattr(Anime, name) for name in dict.fromkeys(names) if name != "id"]
+
+
+# Names that make up Anime.search_text
+ANIME_SEARCH_FIELDS = ["english", "russian", "japanese", "synonyms"]
+ANIME_SEARCH_MIN_LENGTH = 2
+
+
+def build_search_text(anime: dict) -> str:
+    names = [anime.get("english"), anime.get("russian"), anime.get("japanese"), *(anime.get("synonyms") or [])]
+    return " ".join(name for name in names if name).lower()
+
+
+def build_prefix_tsquery(query: str) -> Optional[str]:
+    """'attack tit' -> 'attack:* & tit:*' (every word as a prefix); None if there are no words."""
+    words = re.findall(r"\w+", query.lower())
+    return " & ".join(f"{word}:*" for word in words) if words else None
 
 
 class AnimeRepository():
@@ -33,80 +86,80 @@ class AnimeRepository():
         )
         return result.scalars().all()
 
-    async def get_anime_list(self, page: int, limit: int):
-        query = select(Anime).limit(limit).offset((page - 1) * limit)
-        result = await self.db.execute(query)
-        anime_list = result.scalars().all()
+    async def _fetch_page(self, query, page: int, limit: int, cursor: Optional[str] = None, sort_keys=ANIME_DEFAULT_SORT, signature: str = ANIME_DEFAULT_SORT_SIGNATURE, nullable: Optional[bool] = None):
+        return await fetch_keyset_page(self.db, query, sort_keys, signature, limit, page, cursor, nullable)
 
-        count_query = select(func.count()).select_from(Anime)
-        count_result = await self.db.execute(count_query)
-        total_count = count_result.scalar()
+    async def _count(self, query, count: str):
+        return await count_rows(self.db, query, count, ANIME_COUNT_CACHE)
+
+    async def get_anime_list(self, page: int, limit: int, cursor: Optional[str] = None, count: str = "exact", fields: str = "card"):
+        query = select(*anime_columns(fields))
+        anime_list, next_cursor = await self._fetch_page(query, page, limit, cursor)
+        total_count = await self._count(query, count)
         
-        return {"total_count": total_count, "anime_list": anime_list}
+        return {"total_count": total_count, "anime_list": anime_list, "next_cursor": next_cursor, "has_more": next_cursor is not None}
 
-    
     async def get_anime_by_id(self, anime_id: str):
         anime = await self.db.execute(select(Anime).where(Anime.anime_id == anime_id))
         anime = anime.scalars().first()
         return anime
     
+    async def get_max_updated_at(self):
+        """Newest updatedAt in the table, used as the incremental sync watermark."""
+        result = await self.db.execute(select(func.max(Anime.updatedAt)))
+        return result.scalar()
+
+    async def get_anime_ids_by_status(self, status: str) -> list:
+        result = await self.db.execute(select(Anime.anime_id).where(Anime.status == status))
+        return result.scalars().all()
+
     async def get_anime_by_id_uuid(self, anime_id: UUID):
         anime = await self.db.execute(select(Anime).where(Anime.id == anime_id))
         anime = anime.scalars().first()
         return anime
         
+    def _prepare_anime_row(self, anime: dict):
+        """Validate a parsed anime and convert its date fields in place; None if it can't be stored."""
+        missing = [field for field in ANIME_REQUIRED_FIELDS if anime.get(field) is None]
+        if not anime.get("anime_id") or not anime.get("english"):
+            missing.append("anime_id/english")
+        if missing:
+            logging.warning(f"⚠️ Пропущено аніме без ключових полів {missing}: {anime.get('anime_id')} {anime.get('english')}")
+            return None
+
+        if any(field in anime for field in ANIME_SEARCH_FIELDS):
+            anime["search_text"] = build_search_text(anime)
+
+        # Parse datetime fields with time
+        for field in ['createdAt', 'updatedAt', 'nextEpisodeAt']:
+            if isinstance(anime.get(field), str):
+                try:
+                    anime[field] = datetime.fromisoformat(anime[field]).replace(tzinfo=None)
+                except Exception as e:
+                    logging.error(f"❌ Error parsing datetime field {field}: {e}")
+                    anime[field] = None
+
+        # Parse date fields without time
+        for field in ['aired_on', 'released_on']:
+            if isinstance(anime.get(field), str):
+                try:
+                    anime[field] = parser.parse(anime[field]).date()
+                except Exception as e:
+                    logging.error(f"❌ Error parsing date field {field}: {e}")
+                    anime[field] = None
+        return anime
+
     async def save_anime_list(self, animes: list):
         saved_count = 0
+        started = time.perf_counter()
         for anime in animes:
             try:
-                if not anime.get("anime_id") or not anime.get("english"):
-                    logging.warning(f"⚠️ Пропущено аніме без ключових полів: {anime.get('anime_id')} {anime.get('english')}")
+                if self._prepare_anime_row(anime) is None:
                     continue
 
-                # Parse datetime fields with time
-                for field in ['createdAt', 'updatedAt', 'nextEpisodeAt']:
-                    if anime.get(field):
-                        try:
-                            anime[field] = datetime.fromisoformat(anime[field]).replace(tzinfo=None)
-                        except Exception as e:
-                            logging.error(f"❌ Error parsing datetime field {field}: {e}")
-                            anime[field] = None
-
-                # Parse date fields without time
-                for field in ['aired_on', 'released_on']:
-                    if anime.get(field):
-                        try:
-                            anime[field] = parser.parse(anime[field]).date()
-                        except Exception as e:
-                            logging.error(f"❌ Error parsing date field {field}: {e}")
-                            anime[field] = None
-
                 stmt = insert(Anime).values(**anime).on_conflict_do_update(
                     index_elements=[Anime.anime_id],
-                    set_={
-                        "english": anime["english"],
-                        "russian": anime["russian"],
-                        "kind": anime["kind"],
-                        "rating": anime["rating"],
-                        "score": anime["score"],
-                        "status": anime["status"],
-                        "episodes": anime["episodes"],
-                        "episodesAired": anime["episodesAired"],
-                        "duration": anime["duration"],
-                        "aired_on": anime["aired_on"],
-                        "released_on": anime["released_on"],
-                        "season": anime["season"],
-                        "poster_url": anime["poster_url"],
-                        "updatedAt": anime["updatedAt"],
-                        "nextEpisodeAt": anime["nextEpisodeAt"],
-                        "isCensored": anime["isCensored"],
-                        "screenshots": anime["screenshots"],
-                        "description": anime["description"],
-                        "genre_ids": anime["genre_ids"],
-                        "related_anime_ids": anime["related_anime_ids"],
-                        "related_anime_texts": anime["related_anime_texts"],
-                        "character_ids": anime["character_ids"]
-                    }
+                    set_={column: value for column, value in anime.items() if column not in ANIME_UPSERT_KEEP_FIELDS}
                 )
 
                 await self.db.execute(stmt)
@@ -128,7 +181,62 @@ class AnimeRepository():
                 logging.error(f"🔥 Інша помилка при збереженні аніме: {e}")
                 continue
 
-        return {'message': f"✅ Збережено/оновлено {saved_count} аніме"}
+        elapsed = time.perf_counter() - started
+        return {
+            'message': f"✅ Збережено/оновлено {saved_count} аніме",
+            'saved': saved_count,
+            'skipped': len(animes) - saved_count,
+            'elapsed_seconds': round(elapsed, 3),
+            'rows_per_second': round(saved_count / elapsed, 1) if elapsed else None,
+        }
+
+    async def save_anime_list_bulk(self, animes: list, chunk_size: int = 500):
+        """Upsert a batch of anime with multi-row INSERT ... ON CONFLICT statements in one transaction.
+
+        Rows that fail validation are skipped. If the batch still hits an
+        integrity error (e.g. a duplicate english/russian title), it is rolled
+        back and retried through the per-row path so only the offending rows are lost.
+        """
+        started = time.perf_counter()
+        rows = {}
+        for anime in animes:
+            if self._prepare_anime_row(anime) is not None:
+                # ON CONFLICT DO UPDATE can't touch the same row twice in one statement
+                rows[anime["anime_id"]] = anime
+        rows = list(rows.values())
+        skipped = len(animes) - len(rows)
+
+        # A multi-row VALUES needs the same columns in every row; field profiles may differ
+        row_groups = {}
+        for row in rows:
+            row_groups.setdefault(tuple(sorted(row)), []).append(row)
+
+        try:
+            for group in row_groups.values():
+                for i in range(0, len(group), chunk_size):
+                    chunk = group[i:i + chunk_size]
+                    stmt = insert(Anime).values(chunk)
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=[Anime.anime_id],
+                        set_={column: stmt.excluded[column] for column in chunk[0] if column not in ANIME_UPSERT_KEEP_FIELDS}
+                    )
+                    await self.db.execute(stmt)
+            await self.db.commit()
+        except IntegrityError as e:
+            await self.db.rollback()
+            logging.warning(f"⚠️ Bulk upsert conflict, falling back to per-row save: {e}")
+            result = await self.save_anime_list(rows)
+            result['skipped'] += skipped
+            return result
+
+        elapsed = time.perf_counter() - started
+        return {
+            'message': f"✅ Збережено/оновлено {len(rows)} аніме",
+            'saved': len(rows),
+            'skipped': skipped,
+            'elapsed_seconds': round(elapsed, 3),
+            'rows_per_second': round(len(rows) / elapsed, 1) if elapsed else None,
+        }
     
     
     
@@ -138,77 +246,91 @@ class AnimeRepository():
         await self.db.commit()
         return "All anime deleted successfully"
     
-    async def get_anime_by_name(self, name: str):
-        query = select(Anime).where(
+    async def search_anime(self, query: str, limit: int = 20, cursor: Optional[str] = None, count: str = "none", fields: str = "card", page: int = 1):
+        """Ranked name search over english/russian/japanese/synonyms.
+
+        A row matches when every word is a prefix of a word in its names
+        (full-text, GIN on search_vector) or when the query is close to one of
+        its words by trigram similarity, which tolerates typos (GIN on
+        search_text). Results are ordered by the sum of both scores.
+        """
+        normalized = " ".join(query.lower().split())
+        tsquery_text = build_prefix_tsquery(normalized)
+        if len(normalized) < ANIME_SEARCH_MIN_LENGTH or tsquery_text is None:
+            return {"total_count": 0 if count != "none" else None, "anime_list": [], "next_cursor": None, "has_more": False}
+
+        tsquery = func.to_tsquery(literal_column("'simple'"), tsquery_text)
+        # Never NULL (rows without search_text score 0 on similarity), so pages need no NULL tail
+        rank = func.ts_rank_cd(Anime.search_vector, tsquery) + func.coalesce(func.word_similarity(normalized, Anime.search_text), 0)
+        search_query = select(*anime_columns(fields)).where(
             or_(
-                Anime.english.ilike(f'%{name}%'),
-                Anime.russian.ilike(f'%{name}%')
+                Anime.search_vector.op('@@')(tsquery),
+                # search_text %> q  <=>  word_similarity(q, search_text) above pg_trgm's threshold
+                Anime.search_text.op('%>')(normalized),
             )
         )
-        result = await self.db.execute(query)
-        anime_list = result.scalars().all()
-
-        total_count = len(anime_list)
+        anime_list, next_cursor = await self._fetch_page(
+            search_query, page, limit, cursor,
+            sort_keys=[(rank, True), (Anime.id, True)],
+            signature=f"rank:{normalized}",
+            nullable=False,
+        )
+        total_count = await self._count(search_query, count)
 
-        return {"total_count": total_count, "anime_list": anime_list}
+        return {"total_count": total_count, "anime_list": anime_list, "next_cursor": next_cursor, "has_more": next_cursor is not None}
     
-    async def get_anime_by_genre(self, genre_id: str, page: int, limit: int):
-        count_query = select(func.count()).select_from(Anime).where(
+    async def get_anime_by_genre(self, genre_id: str, page: int, limit: int, cursor: Optional[str] = None, count: str = "exact", fields: str = "card"):
+        query = select(*anime_columns(fields)).where(
             Anime.genre_ids.contains([genre_id])
         )
-        total_count_result = await self.db.execute(count_query)
-        total_count = total_count_result.scalar()
-        
-        query = select(Anime).where(
-            Anime.genre_ids.contains([genre_id])
-        ).limit(limit).offset((page - 1) * limit)
-        result = await self.db.execute(query)
-        anime_list = result.scalars().all()
+        anime_list, next_cursor = await self._fetch_page(query, page, limit, cursor)
+        total_count = await self._count(query, count)
 
-        return {"total_count": total_count, "anime_list": anime_list}
+        return {"total_count": total_count, "anime_list": anime_list, "next_cursor": next_cursor, "has_more": next_cursor is not None}
     
-    async def get_anime_list_by_kind(self, kind: str, page: int, limit: int):
-        count_query = select(func.count()).select_from(Anime).where(Anime.kind == kind)
-        total_count_result = await self.db.execute(count_query)
-        total_count = total_count_result.scalar()
+    async def get_anime_list_by_kind(self, kind: str, page: int, limit: int, cursor: Optional[str] = None, count: str = "exact", fields: str = "card"):
+        query = select(*anime_columns(fields)).where(Anime.kind == kind)
+        anime_list, next_cursor = await self._fetch_page(query, page, limit, cursor)
+        total_count = await self._count(query, count)
         
-        query = select(Anime).where(Anime.kind == kind).limit(limit).offset((page - 1) * limit)
-        result = await self.db.execute(query)
-        anime_list = result.scalars().all()
-        
-        return {"total_count": total_count, "anime_list": anime_list}
+        return {"total_count": total_count, "anime_list": anime_list, "next_cursor": next_cursor, "has_more": next_cursor is not None}
     
-    async def get_anime_list_by_rating(self, rating: str, page: int, limit: int):
-        count_query = select(func.count()).select_from(Anime).where(Anime.rating == rating)
-        total_count_result = await self.db.execute(count_query)
-        total_count = total_count_result.scalar()
-        
-        query = select(Anime).where(Anime.rating == rating).limit(limit).offset((page - 1) * limit)
-        result = await self.db.execute(query)
-        anime_list = result.scalars().all()
+    async def get_anime_list_by_rating(self, rating: str, page: int, limit: int, cursor: Optional[str] = None, count: str = "exact", fields: str = "card"):
+        query = select(*anime_columns(fields)).where(Anime.rating == rating)
+        anime_list, next_cursor = await self._fetch_page(query, page, limit, cursor)
+        total_count = await self._count(query, count)
         
-        return {"total_count": total_count, "anime_list": anime_list}
+        return {"total_count": total_count, "anime_list": anime_list, "next_cursor": next_cursor, "has_more": next_cursor is not None}
     
-    async def get_anime_by_year_range(self, start_year: int, end_year: int):
-        query = select(Anime).where(
-            func.cast(func.split_part(Anime.season, '_', 2), Integer) >= start_year,
-            func.cast(func.split_part(Anime.season, '_', 2), Integer) <= end_year
-        )
+    async def get_facet_rows(self):
+        """(genre_ids, kind, rating, status, aired year) of every anime, for the facet index."""
+        query = select(Anime.genre_ids, Anime.kind, Anime.rating, Anime.status, Anime.aired_year)
         result = await self.db.execute(query)
-        animes = result.scalars().all()
-        count = len(animes)
-        return {"total_count": count, "anime_list": animes}
-    
-    async def get_anime_list_by_status(self, status: str, page: int, limit: int):
-        count_query = select(func.count()).select_from(Anime).where(Anime.status == status)
-        total_count_result = await self.db.execute(count_query)
-        total_count = total_count_result.scalar()
-        
-        query = select(Anime).where(Anime.status == status).limit(limit).offset((page - 1) * limit)
+        return result.all()
+
+    async def get_suggest_rows(self):
+        """Fields of every anime needed by the autocomplete index, in SUGGEST_FIELDS order."""
+        query = select(Anime.id, Anime.anime_id, Anime.english, Anime.russian, Anime.poster_url, Anime.score, Anime.kind)
         result = await self.db.execute(query)
-        anime_list = result.scalars().all()
+        return result.all()
+
+    async def get_anime_by_year_range(self, start_year: int, end_year: int, page: int = 1, limit: int = 10, cursor: Optional[str] = None, count: str = "exact", fields: str = "card"):
+        query = select(*anime_columns(fields)).where(Anime.aired_year.between(start_year, end_year))
+        anime_list, next_cursor = await self._fetch_page(
+            query, page, limit, cursor, sort_keys=ANIME_YEAR_SORT, signature="aired_year:asc,id:asc",
+            # BETWEEN already excludes NULL aired_year: no NULL tail to page into
+            nullable=False,
+        )
+        total_count = await self._count(query, count)
+
+        return {"total_count": total_count, "anime_list": anime_list, "next_cursor": next_cursor, "has_more": next_cursor is not None}
+    
+    async def get_anime_list_by_status(self, status: str, page: int, limit: int, cursor: Optional[str] = None, count: str = "exact", fields: str = "card"):
+        query = select(*anime_columns(fields)).where(Anime.status == status)
+        anime_list, next_cursor = await self._fetch_page(query, page, limit, cursor)
+        total_count = await self._count(query, count)
         
-        return {"total_count": total_count, "anime_list": anime_list}
+        return {"total_count": total_count, "anime_list": anime_list, "next_cursor": next_cursor, "has_more": next_cursor is not None}
     
     async def get_all_kinds(self):
         query = select(distinct(Anime.kind))
@@ -222,12 +344,12 @@ class AnimeRepository():
         ratings = result.scalars().all()
         return ratings
     
-    async def get_anime_list_filtered(self, genre_ids_list: list, kind: str = None, rating: str = None, status: str = None, start_year: int = None, end_year: int = None, page: int = 1, limit: int = 10, sort_by: str = None, sort_order: str = 'asc', filter_by_score: bool = False, filter_by_date: bool = False, filter_by_name: bool = False):
-        query = select(Anime)
+    async def get_anime_list_filtered(self, genre_ids_list: list, kind: str = None, rating: str = None, status: str = None, start_year: int = None, end_year: int = None, page: int = 1, limit: int = 10, sort_by: str = None, sort_order: str = 'asc', filter_by_score: bool = False, filter_by_date: bool = False, filter_by_name: bool = False, cursor: Optional[str] = None, count: str = "exact", fields: str = "card"):
+        query = select(*anime_columns(fields))
         
         if genre_ids_list:
-            for genre_id in genre_ids_list:
-                query = query.where(Anime.genre_ids.contains([genre_id]))
+            # One @> over all genres, served by the GIN index on genre_ids
+            query = query.where(Anime.genre_ids.contains(genre_ids_list))
         if kind:
             query = query.where(Anime.kind == kind)
         if rating:
@@ -235,38 +357,39 @@ class AnimeRepository():
         if status:
             query = query.where(Anime.status == status)
         if start_year and end_year:
-            query = query.where(
-                extract('year', Anime.aired_on) >= start_year,
-                extract('year', Anime.aired_on) <= end_year
-            )
+            query = query.where(Anime.aired_year.between(start_year, end_year))
+
+        # (expression, descending, name); the names make up the cursor signature
+        sort_keys = []
         if filter_by_score:
-            query = query.order_by(Anime.score.desc())
+            sort_keys.append((Anime.score, True, "score"))
         if filter_by_date:
-            query = query.order_by(Anime.aired_on.desc())
+            sort_keys.append((Anime.aired_on, True, "aired_on"))
         if filter_by_name:
-            query = query.order_by(
+            sort_keys.append((
                 case(
                     (Anime.russian.op('~')('^[А-Яа-я]'), 0),  # Russian letters first
                     else_=1
                 ),
-                Anime.russian
-            )
-        
+                False,
+                "cyrillic_first",
+            ))
+            sort_keys.append((Anime.russian, False, "russian"))
         if sort_by:
-            if sort_order == 'desc':
-                query = query.order_by(desc(getattr(Anime, sort_by)))
-            else:
-                query = query.order_by(asc(getattr(Anime, sort_by)))
-                
-        total_query = select(func.count()).select_from(query.alias())
-        total_result = await self.db.execute(total_query)
-        total_count = total_result.scalar()
-        
-        query = query.offset((page - 1) * limit).limit(limit)
-        result = await self.db.execute(query)
-        anime_list = result.scalars().all()
+            sort_keys.append((getattr(Anime, sort_by), sort_order == 'desc', sort_by))
+        if not sort_keys:
+            sort_keys.append((Anime.score, True, "score"))
+        sort_keys.append((Anime.id, sort_keys[0][1] if sort_keys else False, "id"))
+        signature = ",".join(f"{name}:{'desc' if descending else 'asc'}" for _, descending, name in sort_keys)
+
+        anime_list, next_cursor = await self._fetch_page(
+            query, page, limit, cursor,
+            sort_keys=[(key, descending) for key, descending, _ in sort_keys],
+            signature=signature,
+        )
+        total_count = await self._count(query, count)
         
-        return {"total_count": total_count, "anime_list": anime_list}
+        return {"total_count": total_count, "anime_list": anime_list, "next_cursor": next_cursor, "has_more": next_cursor is not None}
 
     async def get_current_episode(self, anime_id: str, user_id: UUID):
         query = select(AnimeCurrentEpisode).where(
@@ -3,12 +3,19 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import delete
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.future import select
-from app.db.models import Character
+from app.db.models import Character, CharacterFetchFailure, Anime
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 from sqlalchemy.exc import SQLAlchemyError
 from dateutil import parser
-from sqlalchemy import func
+from sqlalchemy import func, exists, or_
+from typing import Optional
+from app.utils.pagination import fetch_keyset_page, count_rows
+from sqlalchemy.dialects.postgresql import insert
+import time
+
+# Columns that are NOT NULL on Character
+CHARACTER_REQUIRED_FIELDS = ["character_id", "name", "russian", "poster_url"]
 
 class CharacterRepository:
     def __init__(self, db : AsyncSession):
@@ -30,34 +37,147 @@ class CharacterRepository:
             "characters": characters
         }
     
-    async def get_character_by_name(self, name: str):
-        query = select(Character).where(
-                Character.russian.ilike(f'%{name}%')
-        )
-        result = await self.db.execute(query)
-        character_list = result.scalars().all()
+    async def get_character_by_name(self, name: str, limit: int = 20, cursor: Optional[str] = None, count: str = "exact"):
+        """Trigram search over name, russian and japanese, best word match first.
 
-        total_count = len(character_list)
+        A character matches when a column contains the query or has a word
+        trigram-close to it (typos); both are served by the gin_trgm_ops indexes.
+        """
+        query_text = " ".join(name.split())
+        if not query_text:
+            return {"total_count": 0, "character_list": [], "next_cursor": None, "has_more": False}
 
-        return {"total_count": total_count, "character_list": character_list}
+        columns = [Character.name, Character.russian, Character.japanese]
+        query = select(Character).where(or_(
+            *[column.icontains(query_text, autoescape=True) for column in columns],
+            *[column.op('%>')(query_text) for column in columns],
+        ))
+        rank = func.greatest(*[func.coalesce(func.word_similarity(query_text, column), 0) for column in columns])
+        character_list, next_cursor = await fetch_keyset_page(
+            self.db, query, [(rank, True), (Character.id, True)], f"rank:{query_text.lower()}", limit, cursor=cursor, nullable=False,
+        )
+        total_count = await count_rows(self.db, query, count, "character:count")
+
+        return {"total_count": total_count, "character_list": character_list, "next_cursor": next_cursor, "has_more": next_cursor is not None}
     
     async def get_character_by_id(self, character_id: str):
         character = await self.db.execute(select(Character).where(Character.character_id == character_id))
         character = character.scalars().first()
         return character
     
+    async def get_missing_character_ids(self, max_failures: int, retry_days: int) -> list:
+        """Character ids referenced by Anime.character_ids that aren't in the character table yet.
+
+        Ids that failed `max_failures` times are left out until their last
+        failure is `retry_days` old.
+        """
+        referenced = select(func.unnest(Anime.character_ids).label("character_id")).distinct().subquery()
+        retry_before = func.now() - timedelta(days=retry_days)
+        query = select(referenced.c.character_id).where(
+            ~exists().where(Character.character_id == referenced.c.character_id),
+            ~exists().where(
+                CharacterFetchFailure.character_id == referenced.c.character_id,
+                CharacterFetchFailure.failures >= max_failures,
+                CharacterFetchFailure.last_failed_at > retry_before,
+            ),
+        )
+        result = await self.db.execute(query)
+        return result.scalars().all()
+
+    async def record_fetch_failures(self, reasons: dict):
+        """Count one more failed fetch for each character id in `reasons` (id -> reason)."""
+        if not reasons:
+            return
+        rows = [{"character_id": character_id, "reason": reason} for character_id, reason in reasons.items()]
+        stmt = insert(CharacterFetchFailure).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CharacterFetchFailure.character_id],
+            set_={
+                "failures": CharacterFetchFailure.failures + 1,
+                "reason": stmt.excluded.reason,
+                "last_failed_at": func.now(),
+            },
+        )
+        await self.db.execute(stmt)
+        await self.db.commit()
+
+    @staticmethod
+    def missing_required_fields(character: dict) -> list:
+        return [field for field in CHARACTER_REQUIRED_FIELDS if character.get(field) is None]
+
+    def _validate_character(self, character: dict) -> bool:
+        missing = self.missing_required_fields(character)
+        if missing:
+            logging.warning(f"Skipping character {character.get('character_id')} without {missing}")
+            return False
+        return True
+
     async def save_characters_list(self,characters: list):
+        saved_count = 0
+        started = time.perf_counter()
         for character in characters:
+            if not self._validate_character(character):
+                continue
             try:
-                character_instance = Character(**character)
-                self.db.add(character_instance)
+                stmt = insert(Character).values(**character).on_conflict_do_update(
+                    index_elements=[Character.character_id],
+                    set_={column: value for column, value in character.items() if column != "character_id"}
+                )
+                await self.db.execute(stmt)
                 await self.db.commit()
-                await self.db.refresh(character_instance)
+                saved_count += 1
                 
             except IntegrityError as e:
                 await self.db.rollback()
                 logging.error(f"Duplicate entry for character: {character.get('name', 'unknown')}, Error: {e}")
                 continue
+
+        elapsed = time.perf_counter() - started
+        return {
+            "saved": saved_count,
+            "skipped": len(characters) - saved_count,
+            "elapsed_seconds": round(elapsed, 3),
+            "rows_per_second": round(saved_count / elapsed, 1) if elapsed else None,
+        }
+
+    async def save_characters_list_bulk(self, characters: list):
+        """Upsert characters with one multi-row INSERT ... ON CONFLICT (character_id) DO UPDATE.
+
+        Falls back to the per-row path when the batch hits another unique
+        constraint (name/russian), so only the conflicting rows are skipped.
+        """
+        started = time.perf_counter()
+        rows = {}
+        for character in characters:
+            if self._validate_character(character):
+                rows[character["character_id"]] = character
+        rows = list(rows.values())
+        skipped = len(characters) - len(rows)
+        if not rows:
+            return {"saved": 0, "skipped": skipped, "elapsed_seconds": 0, "rows_per_second": None}
+
+        try:
+            stmt = insert(Character).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Character.character_id],
+                set_={column: stmt.excluded[column] for column in rows[0] if column != "character_id"}
+            )
+            await self.db.execute(stmt)
+            await self.db.commit()
+        except IntegrityError as e:
+            await self.db.rollback()
+            logging.warning(f"Bulk character upsert conflict, falling back to per-row save: {e}")
+            result = await self.save_characters_list(rows)
+            result["skipped"] += skipped
+            return result
+
+        elapsed = time.perf_counter() - started
+        return {
+            "saved": len(rows),
+            "skipped": skipped,
+            "elapsed_seconds": round(elapsed, 3),
+            "rows_per_second": round(len(rows) / elapsed, 1) if elapsed else None,
+        }
             
     async def delete_all(self):
         query = delete(Character)
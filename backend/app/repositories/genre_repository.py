@@ -1,5 +1,6 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.dialects.postgresql import insert
 from app.db.models import Genre
 
 class GenreRepository:
@@ -17,6 +18,14 @@ class GenreRepository:
             await self.db.refresh(genre)
         return genre
     
+    async def insert_genres(self, genres: list):
+        """Bulk insert genres, silently skipping ones that already exist."""
+        if not genres:
+            return
+        stmt = insert(Genre).values(genres).on_conflict_do_nothing()
+        await self.db.execute(stmt)
+        await self.db.commit()
+    
     async def get_genres_list(self):
         query = select(Genre)
         result = await self.db.execute(query)
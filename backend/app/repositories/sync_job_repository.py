@@ -0,0 +1,87 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import func
+from typing import List, Optional
+from app.db.models import SyncJob
+
+SYNC_STATUS_QUEUED = "queued"
+SYNC_STATUS_RUNNING = "running"
+SYNC_STATUS_COMPLETED = "completed"
+SYNC_STATUS_FAILED = "failed"
+
+
+class SyncJobRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_resumable_job(self, kind: str) -> Optional[SyncJob]:
+        """Latest job of this kind that never completed (crashed, aborted or still marked running)."""
+        query = select(SyncJob).where(
+            SyncJob.kind == kind,
+            SyncJob.status != SYNC_STATUS_COMPLETED,
+        ).order_by(SyncJob.started_at.desc()).limit(1)
+        result = await self.db.execute(query)
+        return result.scalars().first()
+
+    async def get_job(self, job_id) -> Optional[SyncJob]:
+        return await self.db.get(SyncJob, job_id)
+
+    async def get_queued_job(self) -> Optional[SyncJob]:
+        """Oldest job waiting for the worker."""
+        query = select(SyncJob).where(SyncJob.status == SYNC_STATUS_QUEUED).order_by(SyncJob.started_at).limit(1)
+        result = await self.db.execute(query)
+        return result.scalars().first()
+
+    async def create_job(self, kind: str, total_pages: Optional[int] = None, status: str = SYNC_STATUS_RUNNING, params: Optional[dict] = None) -> SyncJob:
+        job = SyncJob(
+            kind=kind,
+            status=status,
+            params=params,
+            last_page=0,
+            resume_page=1,
+            total_pages=total_pages,
+            items_saved=0,
+            error_count=0,
+            failed_pages=[],
+        )
+        self.db.add(job)
+        await self.db.commit()
+        await self.db.refresh(job)
+        return job
+
+    async def resume_job(self, job: SyncJob) -> SyncJob:
+        job.status = SYNC_STATUS_RUNNING
+        job.resume_page = job.last_page + 1
+        job.resumed_at = func.now()
+        job.finished_at = None
+        await self.db.commit()
+        await self.db.refresh(job)
+        return job
+
+    async def queue_job(self, job: SyncJob, params: Optional[dict] = None) -> SyncJob:
+        job.status = SYNC_STATUS_QUEUED
+        job.params = params
+        await self.db.commit()
+        await self.db.refresh(job)
+        return job
+
+    async def update_progress(self, job: SyncJob, last_page: int, items_saved: int, failed_pages: List[int], last_error: Optional[str] = None):
+        job.last_page = max(job.last_page, last_page)
+        job.items_saved = items_saved
+        # The pipeline carries the job's earlier failed pages, so this is the full outstanding set
+        job.failed_pages = sorted(set(failed_pages))
+        job.error_count = len(job.failed_pages)
+        if last_error:
+            job.last_error = last_error
+        await self.db.commit()
+
+    async def finish_job(self, job: SyncJob, status: str):
+        job.status = status
+        job.finished_at = func.now()
+        await self.db.commit()
+        await self.db.refresh(job)
+
+    async def get_latest_jobs(self, limit: int = 10) -> List[SyncJob]:
+        query = select(SyncJob).order_by(SyncJob.started_at.desc()).limit(limit)
+        result = await self.db.execute(query)
+        return result.scalars().all()
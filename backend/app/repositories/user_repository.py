@@ -14,6 +14,9 @@ from app.schemas.auth_schemas import TokenData
 from fastapi import HTTPException
 from app.schemas.user_schemas import UserSchema
 from uuid import UUID
+from sqlalchemy import func, or_
+from typing import Optional
+from app.utils.pagination import fetch_keyset_page, count_rows
 
 settings = Settings()
 
@@ -27,16 +30,23 @@ class UserRepository():
         user = user.scalars().first()
         return user
     
-    async def get_user_by_name(self, name: str) -> dict:
-        query = select(User).where(
-                User.username.ilike(f'%{name}%')
-        )
-        result = await self.db.execute(query)
-        user_list = result.scalars().all()
+    async def get_user_by_name(self, name: str, limit: int = 20, cursor: Optional[str] = None, count: str = "exact") -> dict:
+        """Usernames containing `name` or trigram-similar to it; the exact username ranks first."""
+        query_text = name.strip()
+        if not query_text:
+            return {"total_count": 0, "user_list": [], "next_cursor": None, "has_more": False}
 
-        total_count = len(user_list)
+        query = select(User).where(or_(
+            User.username.icontains(query_text, autoescape=True),
+            User.username.op('%')(query_text),
+        ))
+        rank = func.similarity(User.username, query_text)
+        user_list, next_cursor = await fetch_keyset_page(
+            self.db, query, [(rank, True), (User.id, True)], f"rank:{query_text.lower()}", limit, cursor=cursor, nullable=False,
+        )
+        total_count = await count_rows(self.db, query, count, "user:count")
 
-        return {"total_count": total_count, "user_list": user_list}
+        return {"total_count": total_count, "user_list": user_list, "next_cursor": next_cursor, "has_more": next_cursor is not None}
         
     async def get_all_users(self, page: int, limit: int):
         query = select(User).limit(limit).offset((page - 1) * limit)
@@ -13,33 +13,50 @@ from fastapi.security import OAuth2PasswordRequestForm
 from typing import Annotated
 from app.services.user_service import get_current_user_from_token
 from app.utils.utils import KIND_ENUM ,RATING_ENUM, STATUS_ENUM
+from app.services.shikimori_queries import ANIME_FIELD_PROFILES
+from app.utils.pagination import COUNT_STRATEGIES, CURSOR_DESCRIPTION, COUNT_DESCRIPTION
+from app.utils.json_response import FastJSONResponse
+from typing import Optional
 
 
-anime_router = APIRouter()
+anime_router = APIRouter(default_response_class=FastJSONResponse)
+
+FIELDS_DESCRIPTION = "Columns of each anime: card (default), minimal, full, or a comma-separated list of columns and presets such as card,character_ids"
 
 @anime_router.get("/save-anime-list-in-db",)
-async def save_anime_list_in_db(db: AsyncSession = Depends(get_session)):
+async def save_anime_list_in_db(bulk: bool = True, incremental: bool = False, profile: Optional[str] = Query(None, enum=list(ANIME_FIELD_PROFILES)), db: AsyncSession = Depends(get_session)):
+    # Only queues the sync; the worker process (python -m app.worker) runs it
     service = AnimeService(db)
-    result = await service.save_anime_list_in_db()
+    result = await service.queue_anime_sync(incremental, bulk, profile)
     return result
 
+@anime_router.get("/search")
+async def search_anime(q: str, limit: int = Query(20, ge=1, le=50), cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION), count: str = Query("none", enum=COUNT_STRATEGIES, description=COUNT_DESCRIPTION), fields: str = Query("card", description=FIELDS_DESCRIPTION), db: AsyncSession = Depends(get_session)):
+    service = AnimeService(db)
+    return FastJSONResponse(await service.search_anime(q, limit, cursor, count, fields))
+
+@anime_router.get("/suggest")
+async def suggest_anime(q: str, limit: int = Query(10, ge=1, le=10), db: AsyncSession = Depends(get_session)):
+    service = AnimeService(db)
+    return FastJSONResponse(await service.suggest_anime(q, limit))
+
 @anime_router.get("/name/{name}")
-async def get_anime_by_name(name: str, db: AsyncSession = Depends(get_session)):
+async def get_anime_by_name(name: str, page: int = 1, limit: int = Query(50, ge=1, le=100), cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION), fields: str = Query("card", description=FIELDS_DESCRIPTION), db: AsyncSession = Depends(get_session)):
+    # Paged like the other listings (page/limit or cursor), with an exact total_count for page numbers
     service = AnimeService(db)
-    result = await service.get_anime_by_name(name)
-    return result
+    return FastJSONResponse(await service.search_anime(name, limit, cursor, "exact", fields, page))
 
 @anime_router.get("/genre/{genre}")
-async def get_anime_by_genre(genre: str, page: int = 1, limit: int = 10, db: AsyncSession = Depends(get_session)):
+async def get_anime_by_genre(genre: str, page: int = 1, limit: int = 10, cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION), count: str = Query("exact", enum=COUNT_STRATEGIES, description=COUNT_DESCRIPTION), fields: str = Query("card", description=FIELDS_DESCRIPTION), db: AsyncSession = Depends(get_session)):
     service = AnimeService(db)
-    result = await service.get_anime_by_genre(genre, page, limit)
-    return result
+    result = await service.get_anime_by_genre(genre, page, limit, cursor, count, fields)
+    return FastJSONResponse(result)
 
 @anime_router.get("/id/{anime_id}")
 async def get_anime_by_id(anime_id: str, db: AsyncSession = Depends(get_session)):
     service = AnimeService(db)
     result = await service.get_anime_by_id(anime_id)
-    return result
+    return FastJSONResponse(result)
 
 @anime_router.delete("/delete-all-anime")
 async def delete_all_anime(db: AsyncSession = Depends(get_session)):
@@ -48,38 +65,43 @@ async def delete_all_anime(db: AsyncSession = Depends(get_session)):
     return {"detail": f"{result}"}
 
 @anime_router.get("/get-anime-list")
-async def get_anime_list(page: int = 1, limit: int = 10, db: AsyncSession = Depends(get_session)):
+async def get_anime_list(page: int = 1, limit: int = 10, cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION), count: str = Query("exact", enum=COUNT_STRATEGIES, description=COUNT_DESCRIPTION), fields: str = Query("card", description=FIELDS_DESCRIPTION), db: AsyncSession = Depends(get_session)):
     service = AnimeService(db)
-    result = await service.get_anime_list(page, limit)
-    return result
+    result = await service.get_anime_list(page, limit, cursor, count, fields)
+    return FastJSONResponse(result)
 
 @anime_router.get("/get-anime-list-by-kind/{kind}")
-async def get_anime_list_by_kind(kind: str = Path(..., description="Select kind", enum=KIND_ENUM), page: int = 1, limit: int = 10, db: AsyncSession = Depends(get_session)):
+async def get_anime_list_by_kind(kind: str = Path(..., description="Select kind", enum=KIND_ENUM), page: int = 1, limit: int = 10, cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION), count: str = Query("exact", enum=COUNT_STRATEGIES, description=COUNT_DESCRIPTION), fields: str = Query("card", description=FIELDS_DESCRIPTION), db: AsyncSession = Depends(get_session)):
     service = AnimeService(db)
-    result = await service.get_anime_list_by_kind(kind, page, limit)
-    return result
+    result = await service.get_anime_list_by_kind(kind, page, limit, cursor, count, fields)
+    return FastJSONResponse(result)
 
 @anime_router.get("/get-anime-list-by-rating/{rating}")
-async def get_anime_list_by_rating(rating: str = Path(..., description="Select rating", enum=RATING_ENUM), page: int = 1, limit: int = 10, db: AsyncSession = Depends(get_session)):
+async def get_anime_list_by_rating(rating: str = Path(..., description="Select rating", enum=RATING_ENUM), page: int = 1, limit: int = 10, cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION), count: str = Query("exact", enum=COUNT_STRATEGIES, description=COUNT_DESCRIPTION), fields: str = Query("card", description=FIELDS_DESCRIPTION), db: AsyncSession = Depends(get_session)):
     service = AnimeService(db)
-    result = await service.get_anime_list_by_rating(rating, page, limit)
-    return result
+    result = await service.get_anime_list_by_rating(rating, page, limit, cursor, count, fields)
+    return FastJSONResponse(result)
 
 @anime_router.get("/get-anime-list-by-status/{status}")
-async def get_anime_list_by_status(status: str = Path(..., description="Select status", enum=STATUS_ENUM), page: int = 1, limit: int = 10, db: AsyncSession = Depends(get_session)):
+async def get_anime_list_by_status(status: str = Path(..., description="Select status", enum=STATUS_ENUM), page: int = 1, limit: int = 10, cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION), count: str = Query("exact", enum=COUNT_STRATEGIES, description=COUNT_DESCRIPTION), fields: str = Query("card", description=FIELDS_DESCRIPTION), db: AsyncSession = Depends(get_session)):
     service = AnimeService(db)
-    result = await service.get_anime_list_by_status(status, page, limit)
-    return result
+    result = await service.get_anime_list_by_status(status, page, limit, cursor, count, fields)
+    return FastJSONResponse(result)
 
 @anime_router.get("/anime/by-year-range")
-async def get_anime_by_year_range(start_year: int, end_year: int, db: AsyncSession = Depends(get_session)):
+async def get_anime_by_year_range(start_year: int, end_year: int, page: int = 1, limit: int = 10, cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION), count: str = Query("exact", enum=COUNT_STRATEGIES, description=COUNT_DESCRIPTION), fields: str = Query("card", description=FIELDS_DESCRIPTION), db: AsyncSession = Depends(get_session)):
     service = AnimeService(db)
-    return await service.get_anime_by_year_range(start_year, end_year)
+    return FastJSONResponse(await service.get_anime_by_year_range(start_year, end_year, page, limit, cursor, count, fields))
 
 @anime_router.get("/get-anime-list-filtered")
-async def get_anime_list_filtered(genre_id: List[str] = Query(None, description="List of genre IDs"), kind: str = None, rating: str = None, status: str = None, start_year: int = None, end_year: int = None, page: int = 1, limit: int = 10, sort_by: str = None, sort_order: str = 'asc', filter_by_score: bool = False, filter_by_date: bool = False, filter_by_name: bool = False, db: AsyncSession = Depends(get_session)):
+async def get_anime_list_filtered(genre_id: List[str] = Query(None, description="List of genre IDs"), kind: str = None, rating: str = None, status: str = None, start_year: int = None, end_year: int = None, page: int = 1, limit: int = 10, sort_by: str = None, sort_order: str = 'asc', filter_by_score: bool = False, filter_by_date: bool = False, filter_by_name: bool = False, cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION), count: str = Query("exact", enum=COUNT_STRATEGIES, description=COUNT_DESCRIPTION), fields: str = Query("card", description=FIELDS_DESCRIPTION), db: AsyncSession = Depends(get_session)):
+    service = AnimeService(db)
+    return FastJSONResponse(await service.get_anime_list_filtered(genre_id, kind, rating, status, start_year, end_year, page, limit, sort_by, sort_order, filter_by_score, filter_by_date, filter_by_name, cursor, count, fields))
+
+@anime_router.get("/facets")
+async def get_anime_facets(genre_id: List[str] = Query(None, description="List of genre IDs"), kind: str = None, rating: str = None, status: str = None, start_year: int = None, end_year: int = None, db: AsyncSession = Depends(get_session)):
     service = AnimeService(db)
-    return await service.get_anime_list_filtered(genre_id, kind, rating, status, start_year, end_year, page, limit, sort_by, sort_order, filter_by_score, filter_by_date, filter_by_name)
+    return FastJSONResponse(await service.get_anime_facets(genre_id, kind, rating, status, start_year, end_year))
 
 @anime_router.get("/kinds")
 async def get_all_kinds(db: AsyncSession = Depends(get_session)):
@@ -8,8 +8,9 @@ from typing import List
 from app.services.user_service import get_current_user_from_token
 from app.utils.utils import ANIME_SAVE_LIST_ENUM
 from app.schemas.anime_schemas import AnimeSaveListResponse, AnimeSaveListStatusResponse
+from app.utils.json_response import FastJSONResponse
 
-anime_save_list_router = APIRouter()
+anime_save_list_router = APIRouter(default_response_class=FastJSONResponse)
 
 
 @anime_save_list_router.post("/create-anime-save-list/{list_name}", response_model=AnimeSaveListResponse)
@@ -12,20 +12,30 @@ from pydantic import BaseModel
 from fastapi.security import OAuth2PasswordRequestForm
 from typing import Annotated
 from app.services.user_service import get_current_user_from_token
+from app.utils.pagination import COUNT_STRATEGIES, CURSOR_DESCRIPTION, COUNT_DESCRIPTION
+from fastapi import Query
+from typing import Optional
 
 
 character_router = APIRouter()
 
 @character_router.get("/save-character-list-in-db",)
 async def save_character_list_in_db(db: AsyncSession = Depends(get_session)):
+    # Only queues the sync; the worker process (python -m app.worker) runs it
     service = CharacterService(db)
-    result = await service.save_characters_list_in_db()
+    result = await service.queue_character_sync()
     return result
 
+@character_router.get("/backfill-missing-characters")
+async def backfill_missing_characters(db: AsyncSession = Depends(get_session)):
+    # Only queues the backfill; the worker process runs it
+    service = CharacterService(db)
+    return await service.queue_character_backfill()
+
 @character_router.get("/name/{name}")
-async def get_character_by_name(name: str, db: AsyncSession = Depends(get_session)):
+async def get_character_by_name(name: str, limit: int = Query(20, ge=1, le=100), cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION), count: str = Query("exact", enum=COUNT_STRATEGIES, description=COUNT_DESCRIPTION), db: AsyncSession = Depends(get_session)):
     service = CharacterService(db)
-    result = await service.get_character_by_name(name)
+    result = await service.get_character_by_name(name, limit, cursor, count)
     return result
 
 @character_router.delete("/delete-all-characters")
@@ -14,10 +14,11 @@ from app.services.user_service import get_current_user_from_token
 from app.utils.utils import KIND_ENUM ,RATING_ENUM, STATUS_ENUM, COMMENT_TYPE_ENUM
 from app.db.models import User
 from typing import Optional
+from app.utils.json_response import FastJSONResponse
 
 
 
-comment_router = APIRouter()
+comment_router = APIRouter(default_response_class=FastJSONResponse)
 
 @comment_router.post("/create-comment-for-anime/{comment_type}")
 async def create_comment_for_anime(anime_id: str, comment_text: str, reply_to_comment_id: Optional[UUID] = None, comment_type: str = Path(..., description="Select type", enum=COMMENT_TYPE_ENUM), db: AsyncSession = Depends(get_session), current_user: User = Depends(get_current_user_from_token)):
@@ -32,7 +33,7 @@ async def create_comment_for_anime(anime_id: str, comment_text: str, reply_to_co
 async def get_all_comments_for_anime(anime_id: str, db: AsyncSession = Depends(get_session)):
     service = CommentService(db)
     result = await service.get_all_comments_for_anime(anime_id)
-    return result
+    return FastJSONResponse(result)
 
 @comment_router.delete("/delete-comment/{comment_id}")
 async def delete_comment(comment_id: UUID, db: AsyncSession = Depends(get_session), current_user: User = Depends(get_current_user_from_token)):
@@ -66,4 +67,4 @@ async def dislike_comment(comment_id: UUID, db: AsyncSession = Depends(get_sessi
 async def get_3_latest_comments(db: AsyncSession = Depends(get_session)):
     service = CommentService(db)
     result = await service.get_3_latest_comments()
-    return result
\ No newline at end of file
+    return FastJSONResponse(result)
\ No newline at end of file
@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+from app.db.postgresql_connection import get_session
+from app.db.models import User
+from app.services.sync_job_service import SyncJobService
+from app.services.user_service import get_current_admin_from_token
+from app.schemas.sync_schemas import SyncJobSchema
+
+sync_router = APIRouter()
+
+
+@sync_router.get("/jobs", response_model=List[SyncJobSchema])
+async def get_sync_jobs(
+    limit: int = 10,
+    db: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_admin_from_token),
+):
+    """Latest Shikimori sync jobs with checkpoint, error counts, progress and ETA (admin only)."""
+    service = SyncJobService(db)
+    return await service.get_sync_jobs(limit)
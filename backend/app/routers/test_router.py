@@ -2,6 +2,7 @@ from fastapi import APIRouter
 import logging
 from app.db.postgresql_connection import check_connection
 from app.db.redis_connection import check_redis_connection
+from app.cache.response_cache import response_cache
 
 
 logging.basicConfig(level=logging.DEBUG,
@@ -20,4 +21,8 @@ async def health_check():
         "postgres": f"{postgres}",
         "redis": f"{redis}"
     }
-    
\ No newline at end of file
+
+
+@health_check_router.get("/cache")
+async def cache_stats():
+    return response_cache.stats()
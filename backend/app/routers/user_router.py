@@ -16,6 +16,9 @@ from app.db.models import User
 from app.services.user_service import get_current_user_from_token
 from fastapi import Response, Request
 from fastapi.security import OAuth2PasswordRequestForm
+from fastapi import Query
+from typing import Optional
+from app.utils.pagination import COUNT_STRATEGIES, CURSOR_DESCRIPTION, COUNT_DESCRIPTION
 
 
 
@@ -53,9 +56,9 @@ async def get_user_by_id(user_id: UUID, db: AsyncSession = Depends(get_session))
     return user
 
 @user_router.get("/name/{name}")
-async def get_user_by_name(name: str, db: AsyncSession = Depends(get_session)):
+async def get_user_by_name(name: str, limit: int = Query(20, ge=1, le=100), cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION), count: str = Query("exact", enum=COUNT_STRATEGIES, description=COUNT_DESCRIPTION), db: AsyncSession = Depends(get_session)):
     service = UserService(db)
-    result = await service.get_user_by_name(name)
+    result = await service.get_user_by_name(name, limit, cursor, count)
     return result
     
 
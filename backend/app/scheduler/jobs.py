@@ -0,0 +1,95 @@
+import logging
+from typing import Optional
+
+from app.db.postgresql_connection import async_session_worker
+from app.scheduler.locks import advisory_lock, ANIME_SYNC_LOCK, CHARACTER_SYNC_LOCK
+from app.repositories.sync_job_repository import SyncJobRepository
+from app.services.anime_service import AnimeService, ANIME_FULL_SYNC, ANIME_DELTA_SYNC
+from app.services.character_service import CharacterService, CHARACTER_FULL_SYNC, CHARACTER_BACKFILL
+from app.services.sync_job_service import SyncJobService
+from app.services.news_parser import news_cache
+
+logger = logging.getLogger(__name__)
+
+
+async def run_anime_delta_sync():
+    async with advisory_lock(ANIME_SYNC_LOCK) as acquired:
+        if not acquired:
+            logger.info("Anime sync is running elsewhere, skipping incremental sync")
+            return
+        async with async_session_worker() as db:
+            await AnimeService(db).sync_anime_delta()
+
+
+async def run_anime_full_sync(bulk: bool = True, profile: Optional[str] = None):
+    async with advisory_lock(ANIME_SYNC_LOCK) as acquired:
+        if not acquired:
+            logger.info("Anime sync is running elsewhere, skipping full sync")
+            return
+        async with async_session_worker() as db:
+            # Picks up a queued or interrupted anime_full job through run_checkpointed
+            await AnimeService(db).save_anime_list_in_db(bulk, profile)
+
+
+async def run_queued_anime_delta_sync(job_id, profile: Optional[str] = None):
+    async with advisory_lock(ANIME_SYNC_LOCK) as acquired:
+        if not acquired:
+            logger.info("Anime sync is running elsewhere, queued incremental sync waits")
+            return
+        async with async_session_worker() as db:
+            await SyncJobService(db).run_queued(job_id, lambda: AnimeService(db).sync_anime_delta(profile))
+
+
+async def run_queued_syncs():
+    """Run the oldest sync queued through the API (the anime and character sync endpoints).
+
+    A job whose lock is taken stays queued and is picked up on a later poll.
+    """
+    async with async_session_worker() as db:
+        job = await SyncJobRepository(db).get_queued_job()
+        if job is None:
+            return
+        job_id, kind, params = job.id, job.kind, job.params or {}
+    logger.info(f"Running queued {kind} sync {job_id}")
+    if kind == ANIME_FULL_SYNC:
+        await run_anime_full_sync(**params)
+    elif kind == ANIME_DELTA_SYNC:
+        await run_queued_anime_delta_sync(job_id, **params)
+    elif kind == CHARACTER_FULL_SYNC:
+        await run_character_sync()
+    elif kind == CHARACTER_BACKFILL:
+        await run_queued_character_backfill(job_id)
+    else:
+        logger.warning(f"Don't know how to run queued {kind} sync {job_id}")
+
+
+async def run_character_sync():
+    async with advisory_lock(CHARACTER_SYNC_LOCK) as acquired:
+        if not acquired:
+            logger.info("Character sync is running elsewhere, skipping")
+            return
+        async with async_session_worker() as db:
+            # Picks up a queued or interrupted character_full job through run_checkpointed
+            await CharacterService(db).save_characters_list_in_db()
+
+
+async def run_character_backfill():
+    async with advisory_lock(CHARACTER_SYNC_LOCK) as acquired:
+        if not acquired:
+            logger.info("Character sync is running elsewhere, skipping backfill")
+            return
+        async with async_session_worker() as db:
+            await CharacterService(db).backfill_missing_characters()
+
+
+async def run_queued_character_backfill(job_id):
+    async with advisory_lock(CHARACTER_SYNC_LOCK) as acquired:
+        if not acquired:
+            logger.info("Character sync is running elsewhere, queued backfill waits")
+            return
+        async with async_session_worker() as db:
+            await SyncJobService(db).run_queued(job_id, lambda: CharacterService(db).backfill_missing_characters())
+
+
+async def run_news_refresh():
+    await news_cache.refresh()
@@ -0,0 +1,36 @@
+import logging
+import zlib
+from contextlib import asynccontextmanager
+
+from sqlalchemy import text
+
+from app.db.postgresql_connection import engine_worker
+
+logger = logging.getLogger(__name__)
+
+ANIME_SYNC_LOCK = "anime_sync"
+CHARACTER_SYNC_LOCK = "character_sync"
+
+
+def _lock_key(name: str) -> int:
+    # hash() is salted per process; crc32 gives every process the same key
+    return zlib.crc32(name.encode("utf-8"))
+
+
+@asynccontextmanager
+async def advisory_lock(name: str):
+    """Try to take a Postgres session-level advisory lock; yields whether it was acquired.
+
+    The lock lives on a dedicated connection for the whole block, so only one
+    holder exists across all web and worker processes.
+    """
+    key = _lock_key(name)
+    async with engine_worker.connect() as connection:
+        acquired = (await connection.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": key})).scalar()
+        await connection.commit()
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                await connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
+                await connection.commit()
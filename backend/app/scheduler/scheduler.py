@@ -1,21 +1,79 @@
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
-from app.services.anime_service import AnimeService  # заміни на свій сервіс
+from app.scheduler.jobs import run_anime_delta_sync, run_anime_full_sync, run_character_sync, run_character_backfill, run_news_refresh, run_queued_syncs
+from app.core.config import Settings
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
+settings = Settings()
 scheduler = AsyncIOScheduler()
 
-def start_scheduler(anime_service: AnimeService):
+def start_scheduler():
+    # Часте інкрементальне оновлення (ongoing + нові/оновлені тайтли)
     scheduler.add_job(
-        anime_service.save_anime_list_in_db,
-        trigger=IntervalTrigger(hours=6),  # Кожні 3 години
+        run_anime_delta_sync,
+        trigger=IntervalTrigger(minutes=settings.anime_delta_sync_minutes),
+        id="update_anime_db_delta",
+        name="Incremental anime update from Shikimori API",
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+        next_run_time=datetime.utcnow(),
+    )
+    # Повна синхронізація рідше
+    scheduler.add_job(
+        run_anime_full_sync,
+        trigger=IntervalTrigger(hours=settings.anime_full_sync_hours),
         id="update_anime_db",
         name="Update anime database from Shikimori API",
         replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+        next_run_time=datetime.utcnow() + timedelta(hours=settings.anime_full_sync_hours),
+    )
+    # Персонажі
+    scheduler.add_job(
+        run_character_sync,
+        trigger=IntervalTrigger(hours=settings.character_sync_hours),
+        id="update_character_db",
+        name="Update character database from Shikimori API",
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+        next_run_time=datetime.utcnow() + timedelta(hours=settings.character_sync_hours),
+    )
+    # Дозавантаження персонажів, на яких посилаються аніме
+    scheduler.add_job(
+        run_character_backfill,
+        trigger=IntervalTrigger(minutes=settings.character_backfill_minutes),
+        id="backfill_characters",
+        name="Fetch characters referenced by anime but missing locally",
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+    )
+    # Синхронізації, поставлені в чергу через API
+    scheduler.add_job(
+        run_queued_syncs,
+        trigger=IntervalTrigger(seconds=settings.sync_queue_poll_seconds),
+        id="run_queued_syncs",
+        name="Run syncs queued through the API",
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+    )
+    # Новини (goha.ru) -> Redis
+    scheduler.add_job(
+        run_news_refresh,
+        trigger=IntervalTrigger(minutes=settings.news_refresh_minutes),
+        id="refresh_news",
+        name="Refresh news feed snapshot",
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True,
         next_run_time=datetime.utcnow(),
     )
 
     scheduler.start()
-    logger.info("Anime DB update scheduler started.")
\ No newline at end of file
+    logger.info("Scheduler started.")
@@ -0,0 +1,26 @@
+from typing import List, Optional
+from pydantic import BaseModel
+from uuid import UUID
+from datetime import datetime
+
+
+class SyncJobSchema(BaseModel):
+    id: UUID
+    kind: str
+    status: str
+    last_page: int
+    total_pages: Optional[int] = None
+    items_saved: int
+    error_count: int
+    failed_pages: List[int] = []
+    last_error: Optional[str] = None
+    params: Optional[dict] = None
+    started_at: datetime
+    updated_at: datetime
+    finished_at: Optional[datetime] = None
+    progress_percent: Optional[float] = None
+    pages_per_minute: Optional[float] = None
+    eta_seconds: Optional[int] = None
+
+    class Config:
+        from_attributes = True
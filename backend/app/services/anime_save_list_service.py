@@ -2,6 +2,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.repositories.anime_save_list_repository import AnimeSaveListRepository
 from app.repositories.anime_repository import AnimeRepository
 from app.repositories.genre_repository import GenreRepository
+from app.services.genre_registry import genre_registry
 from uuid import UUID
 import logging
 import httpx
@@ -154,11 +155,8 @@ class AnimeSaveListService:
 
         # Save genres first
         genres = anime_data.pop("genres", [])
-        genre_ids = []
-        for genre in genres:
-            await self.genre_repository.create_genre_if_not_exists(genre)
-            genre_ids.append(genre["genre_id"])
-        anime_data["genre_ids"] = genre_ids
+        await genre_registry.ensure_genres(self.genre_repository, genres)
+        anime_data["genre_ids"] = [genre["genre_id"] for genre in genres]
 
         # Save the anime using existing repository method
         await self.anime_repository.save_anime_list([anime_data])
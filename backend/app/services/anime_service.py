@@ -1,13 +1,20 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.repositories.anime_repository import AnimeRepository
 from app.repositories.genre_repository import GenreRepository
+from app.services.sync_job_service import SyncJobService
 from app.core.config import Settings
-import requests
+from app.services.shikimori_client import shikimori_client
+from app.services.ingestion_pipeline import PagePipeline
+from app.services.genre_registry import genre_registry
+from app.services.facet_index import facet_index
+from app.services.suggest_index import suggest_index
+from app.services.shikimori_queries import build_animes_query
+from app.cache.response_cache import cached, response_cache, make_cache_key
 import json
-import time
 from fastapi import Depends ,Query ,Path ,Body
-from typing import List
+from typing import List, Optional
 import logging
+import asyncio
 from fastapi import HTTPException
 from datetime import datetime
 from uuid import UUID
@@ -16,282 +23,284 @@ from sqlalchemy.dialects.postgresql import insert
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Full and incremental syncs must not run at the same time in one process
+anime_sync_lock = asyncio.Lock()
+
+ANIME_FULL_SYNC = "anime_full"
+ANIME_DELTA_SYNC = "anime_delta"
+ANIME_PAGE_SIZE = 20  # titles per Shikimori request, by page or by ids
+
+# Response cache namespaces; everything under "anime:" is dropped after a sync
+ANIME_LIST_CACHE = "anime:list"
+ANIME_DETAIL_CACHE = "anime:detail"
+ANIME_DICTIONARY_CACHE = "anime:dictionary"
+ANIME_SEARCH_CACHE = "anime:search"
+
+
+def _parse_updated_at(value: Optional[str]) -> Optional[datetime]:
+    """Parse Shikimori updatedAt the same way AnimeRepository stores it (naive datetime)."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value).replace(tzinfo=None)
+    except ValueError:
+        return None
+
+
 class AnimeService:
     
     settings = Settings()
     def __init__(self, db: AsyncSession):
         self.anime_repository = AnimeRepository(db)
         self.genre_repository = GenreRepository(db)
+        self.sync_job_service = SyncJobService(db)
     
-    async def get_anime_list(self, page: int, limit: int):
-        result = await self.anime_repository.get_anime_list(page, limit)
+    @cached(ANIME_LIST_CACHE + ":all", ttl=settings.cache_ttl_anime_list)
+    async def get_anime_list(self, page: int, limit: int, cursor: Optional[str] = None, count: str = "exact", fields: str = "card"):
+        result = await self.anime_repository.get_anime_list(page, limit, cursor, count, fields)
         return result
     
     async def delete_all(self):
         return await self.anime_repository.delete_all()
     
+    @cached(ANIME_DETAIL_CACHE, ttl=settings.cache_ttl_anime_detail)
     async def get_anime_by_id(self, anime_id: str):
         return await self.anime_repository.get_anime_by_id(anime_id)
     
     
-    async def parse_page_animes(self, page_num):
+    async def parse_page_animes(self, page_num, order: Optional[str] = None, status: Optional[str] = None, profile: str = "full", ids: Optional[List[str]] = None):
         animes = []
-        base_url = "https://shikimori.one/api/graphql"
-        
-        headers = {
-            'User-Agent': 'AnimeParser/1.0',
-            'Accept': 'application/json',
-            'Content-Type': 'application/json'
-        }
+        query = build_animes_query(page_num, limit=ANIME_PAGE_SIZE, profile=profile, order=order, status=status, ids=ids)
 
-        query = f"""
-        {{
-            animes(page: {page_num}, limit: 20) {{
-                id
-                malId
-                name
-                russian
-                licenseNameRu
-                english
-                japanese
-                synonyms
-                kind
-                rating
-                score
-                status
-                episodes
-                episodesAired
-                duration
-                airedOn {{
-                    year
-                    month
-                    day
-                    date
-                }}
-                releasedOn {{
-                    year
-                    month
-                    day
-                    date
-                }}
-                season
-                poster {{
-                    id
-                    originalUrl
-                    mainUrl
-                }}
-                fansubbers
-                fandubbers
-                licensors
-                createdAt
-                updatedAt
-                nextEpisodeAt
-                isCensored
-                genres {{
-                    id
-                    name
-                    russian
-                    kind
-                }}
-                studios {{
-                    id
-                    name
-                    imageUrl
-                }}
-                externalLinks {{
-                    id
-                    kind
-                    url
-                    createdAt
-                    updatedAt
-                }}
-                personRoles {{
-                    id
-                    rolesRu
-                    rolesEn
-                    person {{
-                        id
-                        name
-                        poster {{
-                            id
-                        }}
-                    }}
-                }}
-                characterRoles {{
-                    id
-                    rolesRu
-                    rolesEn
-                    character {{
-                        id
-                        name
-                        poster {{
-                            id
-                        }}
-                    }}
-                }}
-                related {{
-                    id
-                    anime {{
-                        id
-                        name
-                    }}
-                    manga {{
-                        id
-                        name
-                    }}
-                    relationKind
-                    relationText
-                }}
-                videos {{
-                    id
-                    url
-                    name
-                    kind
-                    playerUrl
-                    imageUrl
-                }}
-                screenshots {{
-                    id
-                    originalUrl
-                    x166Url
-                    x332Url
-                }}
-                scoresStats {{
-                    score
-                    count
-                }}
-                statusesStats {{
-                    status
-                    count
-                }}
-                description
-                descriptionHtml
-                descriptionSource
-            }}
-        }}
-        """
+        data = await shikimori_client.query(query)
+        if data is None:
+            logger.error(f"Page {page_num} not fetched")
+            return None
 
-        try:
-            response = requests.post(
-                base_url,
-                headers=headers,
-                json={'query': query}
-            )
-            response.raise_for_status()
+        for anime in data["animes"] or []:
+            genres = [{"genre_id": genre["id"], "name": genre["name"], "russian": genre["russian"]} for genre in anime["genres"]]
+            poster_url = anime["poster"]["originalUrl"] if anime["poster"] is not None else None
+            
             
-            data = response.json()
-            if data["data"]["animes"]:
-                for anime in data["data"]["animes"]:
-                    character_ids = [character["character"]["id"] for character in anime.get("characterRoles", []) if character.get("character")]
-                    related_anime_texts = [related["relationText"] for related in anime.get("related", []) if related.get("anime")]
-                    related_anime_ids = [related["anime"]["id"] for related in anime.get("related", []) if related.get("anime")]
-                    genres = [{"genre_id": genre["id"], "name": genre["name"], "russian": genre["russian"]} for genre in anime["genres"]]
-                    poster_url = anime["poster"]["originalUrl"] if anime["poster"] is not None else None
-                    
-                    
-                    transformed_anime = {
-                        "anime_id": anime["id"],
-                        "english": anime["english"],
-                        "russian": anime["russian"],
-                        "kind": anime["kind"],
-                        "rating": anime["rating"],
-                        "score": anime["score"],
-                        "status": anime["status"],
-                        "episodes": anime["episodes"],
-                        "episodesAired": anime["episodesAired"],
-                        "duration": anime["duration"],
-                        "aired_on": f"{anime['airedOn']['year']}-{anime['airedOn']['month']}-{anime['airedOn']['day']}" if anime["airedOn"] else None,
-                        "released_on": f"{anime['releasedOn']['year']}-{anime['releasedOn']['month']}-{anime['releasedOn']['day']}" if anime["releasedOn"] else None,
-                        "season": anime["season"],
-                        "poster_url": poster_url,
-                        "createdAt": anime["createdAt"],
-                        "updatedAt": anime["updatedAt"],
-                        "nextEpisodeAt": anime["nextEpisodeAt"],
-                        "isCensored": anime["isCensored"],
-                        "screenshots": [s["originalUrl"] for s in anime["screenshots"]],
-                        "description": anime["description"],
-                        "genres": genres,
-                        "related_anime_ids": related_anime_ids,
-                        "related_anime_texts": related_anime_texts,
-                        "character_ids": character_ids
-                    }
-                    animes.append(transformed_anime)
-                logger.info(f"Page {page_num} fetched")
-                print(f"Page {page_num} fetched")
-                
+            transformed_anime = {
+                "anime_id": anime["id"],
+                "english": anime["english"],
+                "russian": anime["russian"],
+                "japanese": anime["japanese"],
+                "synonyms": anime["synonyms"],
+                "kind": anime["kind"],
+                "rating": anime["rating"],
+                "score": anime["score"],
+                "status": anime["status"],
+                "episodes": anime["episodes"],
+                "episodesAired": anime["episodesAired"],
+                "duration": anime["duration"],
+                "aired_on": f"{anime['airedOn']['year']}-{anime['airedOn']['month']}-{anime['airedOn']['day']}" if anime["airedOn"] else None,
+                "released_on": f"{anime['releasedOn']['year']}-{anime['releasedOn']['month']}-{anime['releasedOn']['day']}" if anime["releasedOn"] else None,
+                "season": anime["season"],
+                "poster_url": poster_url,
+                "createdAt": anime["createdAt"],
+                "updatedAt": anime["updatedAt"],
+                "nextEpisodeAt": anime["nextEpisodeAt"],
+                "isCensored": anime["isCensored"],
+                "description": anime["description"],
+                "genres": genres,
+            }
+            # Relation columns are only touched when the profile fetched them,
+            # so a light sync doesn't wipe what the last full sync stored.
+            if "screenshots" in anime:
+                transformed_anime["screenshots"] = [s["originalUrl"] for s in anime["screenshots"]]
+            if "related" in anime:
+                transformed_anime["related_anime_ids"] = [related["anime"]["id"] for related in anime["related"] if related.get("anime")]
+                transformed_anime["related_anime_texts"] = [related["relationText"] for related in anime["related"] if related.get("anime")]
+            if "characterRoles" in anime:
+                transformed_anime["character_ids"] = [character["character"]["id"] for character in anime["characterRoles"] if character.get("character")]
+            animes.append(transformed_anime)
+        logger.info(f"Page {page_num} fetched ({profile})")
+        return animes
+    
+    async def save_anime_batch(self, pages: List[int], animes: list, bulk: bool = True):
+        genres = []
+        for anime in animes:
+            anime_genres = anime.pop("genres")
+            genres.extend(anime_genres)
+            anime["genre_ids"] = [genre["genre_id"] for genre in anime_genres]
+        await genre_registry.ensure_genres(self.genre_repository, genres)
+        if bulk:
+            result = await self.anime_repository.save_anime_list_bulk(animes)
+        else:
+            result = await self.anime_repository.save_anime_list(animes)
+        await response_cache.delete(*[make_cache_key(ANIME_DETAIL_CACHE, {"anime_id": anime["anime_id"]}) for anime in animes])
+        logger.info(f"Anime list saved successfully pages {pages}: {result['saved']} rows, {result['rows_per_second']} rows/s")
+    
+    def _make_pipeline(self, fetch_page, bulk: bool = True, max_page: Optional[int] = None, start_page: int = 1, on_progress=None, stop_on_empty: bool = True) -> PagePipeline:
+        async def write_batch(pages: List[int], animes: list):
+            await self.save_anime_batch(pages, animes, bulk=bulk)
 
-                time.sleep(0.5)
-                return animes        
-        
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error occurred: {e}")
-            return None
+        return PagePipeline(
+            fetch_page=fetch_page,
+            write_batch=write_batch,
+            start_page=start_page,
+            max_page=max_page or self.settings.anime_max_pages,
+            concurrency=self.settings.shikimori_concurrency,
+            queue_size=self.settings.ingestion_queue_size,
+            batch_pages=self.settings.ingestion_batch_pages if bulk else 1,
+            on_progress=on_progress,
+            stop_on_empty=stop_on_empty,
+        )
+    
+    async def queue_anime_sync(self, incremental: bool = False, bulk: bool = True, profile: Optional[str] = None):
+        """Queue a manual sync as a SyncJob; the worker process runs it (see run_queued_syncs)."""
+        if incremental:
+            job = await self.sync_job_service.enqueue(ANIME_DELTA_SYNC, params={"profile": profile}, resumable=False)
+        else:
+            job = await self.sync_job_service.enqueue(ANIME_FULL_SYNC, self.settings.anime_max_pages, {"bulk": bulk, "profile": profile})
+        return {"message": "Anime sync queued, see /sync/jobs for progress", "job_id": job.id, "status": job.status}
+
+    async def save_anime_list_in_db(self, bulk: bool = True, profile: Optional[str] = None):
+        """Full catalogue sync, checkpointed in a SyncJob so an interrupted run resumes where it stopped."""
+        profile = profile or self.settings.anime_full_sync_profile
+
+        async def fetch_page(page_num):
+            return await self.parse_page_animes(page_num, profile=profile)
+
+        def make_pipeline(start_page, on_progress):
+            return self._make_pipeline(fetch_page, bulk, start_page=start_page, on_progress=on_progress)
+
+        async with anime_sync_lock:
+            logger.info("🔄 Scheduler: Почато оновлення аніме з Shikimori")
+            await genre_registry.load(self.genre_repository)
+            stats = await self.sync_job_service.run_checkpointed(ANIME_FULL_SYNC, self.settings.anime_max_pages, make_pipeline)
+            await response_cache.invalidate("anime:*")
+
+        if stats["aborted"]:
+            return {'message': f"Anime sync interrupted, will resume from page {stats['resume_page']}", **stats}
+        if stats["failed_pages"]:
+            return {'message': f"Anime sync finished with {len(stats['failed_pages'])} failed pages, they will be retried on the next run", **stats}
+        return {'message': "Anime list saved successfully", **stats}
     
-    async def save_anime_list_in_db(self):
-        logger.info("🔄 Scheduler: Почато оновлення аніме з Shikimori")
-        for x in range(1, 2500):
-            animes = await self.parse_page_animes(x)
-            if animes:
-                for anime in animes:
-                    genre_ids = []
-                    genres = anime.pop("genres")
-                    for genre in genres:
-                        await self.genre_repository.create_genre_if_not_exists(genre)
-                        genre_id = genre["genre_id"]
-                        genre_ids.append(genre_id)
-                    anime["genre_ids"] = genre_ids
-                await self.anime_repository.save_anime_list(animes)
-                logger.info(f"Anime list saved successfully page {x}")
-            else:
-                logger.info("No animes found")
-                return {'message':"Anime list not saved"}
-        return {'message':"Anime list saved successfully"}
+    async def sync_anime_delta(self, profile: Optional[str] = None):
+        """Incremental sync: refresh ongoing titles and pick up titles updated after the watermark.
+
+        Three passes: every title Shikimori lists as ongoing; titles stored as
+        ongoing that dropped off that list (finished airing, refetched by id);
+        and the newest ids, walked down until nothing is newer than the
+        watermark. Shikimori can't order by updatedAt, so other edits to older
+        titles (score, description, a status change of a title not stored as
+        ongoing) wait for the full sync.
+
+        The watermark is the newest Anime.updatedAt already stored. Without one
+        (empty table) this falls back to a full sync.
+        """
+        watermark = await self.anime_repository.get_max_updated_at()
+        if watermark is None:
+            logger.info("No sync watermark found, running full anime sync")
+            return await self.save_anime_list_in_db()
+        if anime_sync_lock.locked():
+            logger.info("Anime sync already running, skipping incremental sync")
+            return {'message': "Anime sync already running"}
+        profile = profile or self.settings.anime_delta_sync_profile
+
+        seen_ongoing = set()
+
+        async def fetch_ongoing(page_num):
+            animes = await self.parse_page_animes(page_num, status="ongoing", profile=profile)
+            seen_ongoing.update(anime["anime_id"] for anime in animes or [])
+            return animes
+
+        async def fetch_newest(page_num):
+            animes = await self.parse_page_animes(page_num, order="id_desc", profile=profile)
+            if not animes:
+                return animes
+            # An empty result ends paging: everything further down is older than the watermark
+            return [anime for anime in animes if (_parse_updated_at(anime["updatedAt"]) or datetime.min) > watermark]
+
+        async with anime_sync_lock:
+            logger.info(f"🔄 Scheduler: incremental anime sync since {watermark.isoformat()}")
+            await genre_registry.load(self.genre_repository)
+            ongoing = await self._make_pipeline(fetch_ongoing).run()
+
+            stored_ongoing = await self.anime_repository.get_anime_ids_by_status("ongoing")
+            finished_ids = sorted(set(stored_ongoing) - seen_ongoing)
+            chunks = [finished_ids[i:i + ANIME_PAGE_SIZE] for i in range(0, len(finished_ids), ANIME_PAGE_SIZE)]
+
+            async def fetch_finished(page_num):
+                return await self.parse_page_animes(1, profile=profile, ids=chunks[page_num - 1])
+
+            finished = await self._make_pipeline(fetch_finished, max_page=len(chunks), stop_on_empty=False).run() if chunks else None
+            newest = await self._make_pipeline(fetch_newest).run()
+            await response_cache.invalidate("anime:*")
+        stats = {
+            "watermark": watermark.isoformat(),
+            "ongoing": ongoing,
+            "finished": finished,
+            "updated": newest,
+        }
+        logger.info(f"Incremental anime sync finished: {stats}")
+        return {'message': "Anime list updated successfully", **stats}
     
-    async def get_anime_by_name(self, name: str):
-        result = await self.anime_repository.get_anime_by_name(name)
-        return result
+    async def suggest_anime(self, query: str, limit: int = 10):
+        await suggest_index.ensure_loaded(self.anime_repository)
+        return suggest_index.suggest(query, limit)
+
+    @cached(ANIME_SEARCH_CACHE, ttl=settings.cache_ttl_anime_search)
+    async def search_anime(self, query: str, limit: int = 20, cursor: Optional[str] = None, count: str = "none", fields: str = "card", page: int = 1):
+        return await self.anime_repository.search_anime(query, limit, cursor, count, fields, page)
     
-    async def get_anime_by_genre(self, genre_id: str, page: int, limit: int):
-        result = await self.anime_repository.get_anime_by_genre(genre_id, page, limit)
+    @cached(ANIME_LIST_CACHE + ":genre", ttl=settings.cache_ttl_anime_list)
+    async def get_anime_by_genre(self, genre_id: str, page: int, limit: int, cursor: Optional[str] = None, count: str = "exact", fields: str = "card"):
+        result = await self.anime_repository.get_anime_by_genre(genre_id, page, limit, cursor, count, fields)
         if not result:
             raise HTTPException(status_code=404, detail="No anime found")
         return result
     
-    async def get_anime_list_by_kind(self, kind: str, page: int, limit: int):
-        result = await self.anime_repository.get_anime_list_by_kind(kind, page, limit)
+    @cached(ANIME_LIST_CACHE + ":kind", ttl=settings.cache_ttl_anime_list)
+    async def get_anime_list_by_kind(self, kind: str, page: int, limit: int, cursor: Optional[str] = None, count: str = "exact", fields: str = "card"):
+        result = await self.anime_repository.get_anime_list_by_kind(kind, page, limit, cursor, count, fields)
         if not result:
             raise HTTPException(status_code=404, detail="No anime found")
         return result
     
-    async def get_anime_list_by_rating(self, rating: str, page: int, limit: int):
-        result = await self.anime_repository.get_anime_list_by_rating(rating, page, limit)
+    @cached(ANIME_LIST_CACHE + ":rating", ttl=settings.cache_ttl_anime_list)
+    async def get_anime_list_by_rating(self, rating: str, page: int, limit: int, cursor: Optional[str] = None, count: str = "exact", fields: str = "card"):
+        result = await self.anime_repository.get_anime_list_by_rating(rating, page, limit, cursor, count, fields)
         if not result:
             raise HTTPException(status_code=404, detail="No anime found")
         return result
     
-    async def get_anime_list_by_status(self, status: str, page: int, limit: int):
-        result = await self.anime_repository.get_anime_list_by_status(status, page, limit)
+    @cached(ANIME_LIST_CACHE + ":status", ttl=settings.cache_ttl_anime_list)
+    async def get_anime_list_by_status(self, status: str, page: int, limit: int, cursor: Optional[str] = None, count: str = "exact", fields: str = "card"):
+        result = await self.anime_repository.get_anime_list_by_status(status, page, limit, cursor, count, fields)
         if not result:
             raise HTTPException(status_code=404, detail="No anime found")
         return result
     
-    async def get_anime_by_year_range(self, start_year: int, end_year: int):
-        result = await self.anime_repository.get_anime_by_year_range(start_year, end_year)
+    @cached(ANIME_LIST_CACHE + ":year", ttl=settings.cache_ttl_anime_list)
+    async def get_anime_by_year_range(self, start_year: int, end_year: int, page: int = 1, limit: int = 10, cursor: Optional[str] = None, count: str = "exact", fields: str = "card"):
+        result = await self.anime_repository.get_anime_by_year_range(start_year, end_year, page, limit, cursor, count, fields)
         if not result:
             raise HTTPException(status_code=404, detail="No anime found")
         return result
     
-    async def get_anime_list_filtered(self, genre_id: List[str], kind: str = None, rating: str = None, status: str = None, start_year: int = None, end_year: int = None, page: int = 1, limit: int = 10, sort_by: str = None, sort_order: str = 'asc', filter_by_score: bool = False, filter_by_date: bool = False, filter_by_name: bool = False):
+    @cached(ANIME_LIST_CACHE + ":filtered", ttl=settings.cache_ttl_anime_list)
+    async def get_anime_list_filtered(self, genre_id: List[str], kind: str = None, rating: str = None, status: str = None, start_year: int = None, end_year: int = None, page: int = 1, limit: int = 10, sort_by: str = None, sort_order: str = 'asc', filter_by_score: bool = False, filter_by_date: bool = False, filter_by_name: bool = False, cursor: Optional[str] = None, count: str = "exact", fields: str = "card"):
         genre_ids_list = list(set(genre_id)) if genre_id is not None else []
-        result = await self.anime_repository.get_anime_list_filtered(genre_ids_list, kind, rating, status, start_year, end_year, page, limit, sort_by, sort_order , filter_by_score, filter_by_date, filter_by_name)
+        result = await self.anime_repository.get_anime_list_filtered(genre_ids_list, kind, rating, status, start_year, end_year, page, limit, sort_by, sort_order , filter_by_score, filter_by_date, filter_by_name, cursor, count, fields)
         if not result:
             raise HTTPException(status_code=404, detail="No anime found")
         return result
     
+    async def get_anime_facets(self, genre_id: List[str], kind: str = None, rating: str = None, status: str = None, start_year: int = None, end_year: int = None):
+        await facet_index.ensure_loaded(self.anime_repository)
+        genre_ids_list = list(set(genre_id)) if genre_id is not None else []
+        return facet_index.facet_counts(genre_ids_list, kind, rating, status, start_year, end_year)
+    
+    @cached(ANIME_DICTIONARY_CACHE + ":kinds", ttl=settings.cache_ttl_anime_dictionaries)
     async def get_all_kinds(self):
         result = await self.anime_repository.get_all_kinds()
         return result
     
+    @cached(ANIME_DICTIONARY_CACHE + ":ratings", ttl=settings.cache_ttl_anime_dictionaries)
     async def get_all_ratings(self):
         result = await self.anime_repository.get_all_ratings()
         return result
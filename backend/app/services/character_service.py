@@ -2,19 +2,35 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.repositories.anime_repository import AnimeRepository
 from app.repositories.character_repository import CharacterRepository
 from app.core.config import Settings
-import requests
+from app.services.shikimori_client import shikimori_client
+from app.services.ingestion_pipeline import PagePipeline
+from app.services.sync_job_service import SyncJobService
+from typing import List, Optional
 import json
-import time
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+CHARACTER_FULL_SYNC = "character_full"
+CHARACTER_BACKFILL = "character_backfill"
+CHARACTER_IDS_PER_QUERY = 50  # Shikimori caps `limit` at 50
+
+CHARACTER_FIELDS = """
+                id
+                name
+                russian
+                japanese
+                poster { originalUrl }
+                description
+"""
+
 class CharacterService:
     
     settings = Settings()
     def __init__(self, db: AsyncSession):
         self.character_repository = CharacterRepository(db)
+        self.sync_job_service = SyncJobService(db)
         
     async def get_characters_list(self, page: int, limit: int):
         result = await self.character_repository.get_characters_list(page, limit)
@@ -23,85 +39,132 @@ class CharacterService:
     async def get_character_by_id(self, character_id: str):
         return await self.character_repository.get_character_by_id(character_id)
     
-    async def get_character_by_name(self, name: str):
-        return await self.character_repository.get_character_by_name(name)
+    async def get_character_by_name(self, name: str, limit: int = 20, cursor: Optional[str] = None, count: str = "exact"):
+        return await self.character_repository.get_character_by_name(name, limit, cursor, count)
+    
+    @staticmethod
+    def _transform_character(character: dict) -> dict:
+        return {
+            "character_id": character["id"],
+            "name": character["name"],
+            "russian": character["russian"],
+            "japanese": character["japanese"],
+            "poster_url": character["poster"]["originalUrl"] if character["poster"] else None,
+            "description": character["description"]
+        }
     
     async def parse_page_characters(self, page_num):
-        characters = []
-        base_url = "https://shikimori.one/api/graphql"
+        query = f"""
+        {{
+            characters(page: {page_num}, limit: 50) {{{CHARACTER_FIELDS}            }}
+        }}
+        """
         
-        headers = {
-            'User-Agent': 'AnimeParser/1.0',
-            'Accept': 'application/json',
-            'Content-Type': 'application/json'
-        }
+        data = await shikimori_client.query(query)
+        if data is None:
+            logger.error(f"Page characters {page_num} not fetched")
+            return None
 
+        characters = [self._transform_character(character) for character in data["characters"] or []]
+        logger.info(f"Page characters {page_num} fetched")
+        return characters
+    
+    async def parse_characters_by_ids(self, character_ids: List[str]):
+        ids = ", ".join(f'"{character_id}"' for character_id in character_ids)
         query = f"""
         {{
-            characters(page: {page_num}, limit: 50) {{
-                id
-                malId
-                name
-                russian
-                japanese
-                synonyms
-                url
-                createdAt
-                updatedAt
-                isAnime
-                isManga
-                isRanobe
-
-                poster {{ id originalUrl mainUrl }}
-
-                description
-                descriptionHtml
-                descriptionSource
-            }}
+            characters(ids: [{ids}], limit: {len(character_ids)}) {{{CHARACTER_FIELDS}            }}
         }}
         """
-        
-        try:
-            response = requests.post(
-                base_url,
-                headers=headers,
-                json={'query': query}
-            )
-            response.raise_for_status()
-            data = response.json()["data"]["characters"]
-            if data:
-                for character in data:
-                    transformed_character = {
-                        "character_id": character["id"],
-                        "name": character["name"],
-                        "russian": character["russian"],
-                        "japanese": character["japanese"],
-                        "poster_url": character["poster"]["originalUrl"] if character["poster"] else None,
-                        "description": character["description"]
-                    }
-                    characters.append(transformed_character)
-                logger.info(f"Page characters {page_num} fetched")
-                print(f"Page characters{page_num} fetched")
-        
-                time.sleep(0.5)
-                return characters 
-            
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error occurred: {e}")
+
+        data = await shikimori_client.query(query)
+        if data is None:
+            logger.error(f"Characters {character_ids[0]}..{character_ids[-1]} not fetched")
             return None
+        return [self._transform_character(character) for character in data["characters"] or []]
+    
+    async def save_characters_batch(self, pages: List[int], characters: list):
+        result = await self.character_repository.save_characters_list_bulk(characters)
+        logger.info(f"Characters saved pages {pages}: {result['saved']} rows, {result['rows_per_second']} rows/s")
     
+    async def queue_character_sync(self):
+        """Queue a full character sync as a SyncJob; the worker process runs it (see run_queued_syncs)."""
+        job = await self.sync_job_service.enqueue(CHARACTER_FULL_SYNC, self.settings.character_max_pages)
+        return {"message": "Character sync queued, see /sync/jobs for progress", "job_id": job.id, "status": job.status}
+
+    async def queue_character_backfill(self):
+        """Queue a backfill of missing characters; it has no page checkpoint, the missing set is recomputed per run."""
+        job = await self.sync_job_service.enqueue(CHARACTER_BACKFILL, resumable=False)
+        return {"message": "Character backfill queued, see /sync/jobs for progress", "job_id": job.id, "status": job.status}
+
     async def save_characters_list_in_db(self):
-        for x in range(1, 1000):
-            characters = await self.parse_page_characters(x)
-            if characters:
-                await self.character_repository.save_characters_list(characters)
-            else:
-                logger.error(f"Error occurred while fetching page {x}")
-                return None
-            
-        return {"message": "Characters list saved successfully"}
+        """Full character catalogue sync through the same concurrent, checkpointed pipeline as anime."""
+        def make_pipeline(start_page, on_progress):
+            return PagePipeline(
+                fetch_page=self.parse_page_characters,
+                write_batch=self.save_characters_batch,
+                start_page=start_page,
+                max_page=self.settings.character_max_pages,
+                concurrency=self.settings.shikimori_concurrency,
+                queue_size=self.settings.ingestion_queue_size,
+                batch_pages=self.settings.ingestion_batch_pages,
+                on_progress=on_progress,
+            )
+
+        stats = await self.sync_job_service.run_checkpointed(CHARACTER_FULL_SYNC, self.settings.character_max_pages, make_pipeline)
+        if stats["aborted"]:
+            return {"message": f"Character sync interrupted, will resume from page {stats['resume_page']}", **stats}
+        if stats["failed_pages"]:
+            return {"message": f"Character sync finished with {len(stats['failed_pages'])} failed pages, they will be retried on the next run", **stats}
+        return {"message": "Characters list saved successfully", **stats}
     
     
+    async def backfill_missing_characters(self):
+        """Fetch only the characters referenced by Anime.character_ids that are missing locally.
+
+        Ids go to Shikimori in batches of CHARACTER_IDS_PER_QUERY, concurrently
+        under the shared rate limiter. The missing set is recomputed on every
+        run, so an interrupted backfill simply continues next time. Ids
+        Shikimori doesn't return, or returns without required fields, are
+        recorded as fetch failures so they stop being requested every run.
+        """
+        missing_ids = sorted(await self.character_repository.get_missing_character_ids(
+            self.settings.character_backfill_max_failures, self.settings.character_backfill_retry_days,
+        ))
+        if not missing_ids:
+            return {"message": "No missing characters", "missing": 0}
+        chunks = [missing_ids[i:i + CHARACTER_IDS_PER_QUERY] for i in range(0, len(missing_ids), CHARACTER_IDS_PER_QUERY)]
+        logger.info(f"Backfilling {len(missing_ids)} characters in {len(chunks)} requests")
+        unresolved = {}
+
+        async def fetch_chunk(page_num):
+            characters = await self.parse_characters_by_ids(chunks[page_num - 1])
+            if characters is None:
+                # Request failed, the pipeline retries it; not the ids' fault
+                return None
+            returned = {character["character_id"] for character in characters}
+            for character_id in chunks[page_num - 1]:
+                if character_id not in returned:
+                    unresolved[character_id] = "not returned by Shikimori"
+            for character in characters:
+                missing = self.character_repository.missing_required_fields(character)
+                if missing:
+                    unresolved[character["character_id"]] = f"missing {missing}"
+            return characters
+
+        pipeline = PagePipeline(
+            fetch_page=fetch_chunk,
+            write_batch=self.save_characters_batch,
+            max_page=len(chunks),
+            concurrency=self.settings.shikimori_concurrency,
+            queue_size=self.settings.ingestion_queue_size,
+            batch_pages=self.settings.ingestion_batch_pages,
+            stop_on_empty=False,
+        )
+        stats = await pipeline.run()
+        await self.character_repository.record_fetch_failures(unresolved)
+        return {"message": "Missing characters backfilled", "missing": len(missing_ids), "unresolved": len(unresolved), **stats}
+    
     async def delete_all_characters(self):
         result = await self.character_repository.delete_all()
-        return result
\ No newline at end of file
+        return result
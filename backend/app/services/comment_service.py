@@ -4,6 +4,7 @@ from app.repositories.user_repository import UserRepository
 from app.repositories.anime_repository import AnimeRepository
 from app.core.config import Settings
 from app.db.models import CommentTypeEnum
+from app.cache.response_cache import cached, response_cache, make_cache_key
 import requests
 import json
 from uuid import UUID
@@ -16,10 +17,18 @@ from fastapi import HTTPException
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
+settings = Settings()
+
+LATEST_COMMENTS_CACHE = "comment:latest"
+
+
+async def _invalidate_latest_comments():
+    await response_cache.delete(make_cache_key(LATEST_COMMENTS_CACHE, {}))
+
 
 class CommentService:
     
-    settings = Settings()
+    settings = settings
     def __init__(self, db: AsyncSession):
         self.comment_repository = CommentRepository(db)
         self.anime_repository = AnimeRepository(db)
@@ -54,6 +63,7 @@ class CommentService:
             raise HTTPException(status_code=400, detail="Comment text cannot be empty")
         try:
             result = await self.comment_repository.create_comment_for_anime(anime_id, comment_text, user_id, comment_type, id_of_anime, reply_to_comment_id)
+            await _invalidate_latest_comments()
             return result
         except Exception as e:
             logger.error(f"Error in create_comment_for_anime: {str(e)}")
@@ -95,6 +105,7 @@ class CommentService:
             try:
                 await self.comment_repository.delete_reply_to_comment(comment_id)
                 result = await self.comment_repository.delete_comment(comment_id)
+                await _invalidate_latest_comments()
                 return result
             except Exception as e:
                 logger.error(f"Error in delete_comment: {str(e)}")
@@ -116,6 +127,7 @@ class CommentService:
                 raise HTTPException(status_code=400, detail="Comment text cannot be empty")
             try:
                 result = await self.comment_repository.update_comment(comment_id, text)
+                await _invalidate_latest_comments()
                 return result
             except Exception as e:
                 logger.error(f"Error in update_comment: {str(e)}")
@@ -130,6 +142,7 @@ class CommentService:
             raise HTTPException(status_code=404, detail="Comment not found")
         try:
             result = await self.comment_repository.like_comment(comment_id, user_id)
+            await _invalidate_latest_comments()
             return result
         except Exception as e:
             logger.error(f"Error in like_comment: {str(e)}")
@@ -144,11 +157,13 @@ class CommentService:
             raise HTTPException(status_code=404, detail="Comment not found")
         try:
             result = await self.comment_repository.dislike_comment(comment_id, user_id)
+            await _invalidate_latest_comments()
             return result
         except Exception as e:
             logger.error(f"Error in dislike_comment: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Internal Server Error {str(e)}")
         
+    @cached(LATEST_COMMENTS_CACHE, ttl=settings.cache_ttl_latest_comments)
     async def get_3_latest_comments(self):
         try:
             result = await self.comment_repository.get_3_latest_comments()
@@ -0,0 +1,120 @@
+import asyncio
+import fnmatch
+import logging
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from app.cache.response_cache import response_cache
+from app.core.config import Settings
+from app.repositories.anime_repository import AnimeRepository
+
+logger = logging.getLogger(__name__)
+settings = Settings()
+
+FACETS = ["genre", "kind", "rating", "status", "year"]
+
+
+def _bitmap(positions: List[int], size: int) -> int:
+    bits = bytearray((size + 7) // 8)
+    for position in positions:
+        bits[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(bits, "little")
+
+
+class FacetIndex:
+    """In-memory bitmap index of the catalogue's filterable attributes.
+
+    Every anime gets a bit position; each facet value (a genre, kind, rating,
+    status or aired year) is a Python int with the bits of the anime that have
+    it. A filter state is then an AND of bitmaps and each facet count a
+    popcount, so the whole sidebar is computed without touching Postgres.
+    The index is rebuilt lazily after every "anime:*" cache invalidation (i.e.
+    after each sync, in every process) and after `facet_index_ttl_seconds`.
+    """
+
+    def __init__(self):
+        self._bitmaps: Dict[str, Dict[str, int]] = {}
+        self._all = 0
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    def is_fresh(self) -> bool:
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at < settings.facet_index_ttl_seconds
+
+    def invalidate(self):
+        self._loaded_at = None
+
+    def _on_cache_invalidated(self, namespace: str):
+        if fnmatch.fnmatchcase("anime:facets", namespace):
+            self.invalidate()
+
+    async def load(self, anime_repository: AnimeRepository):
+        started = time.perf_counter()
+        rows = await anime_repository.get_facet_rows()
+        positions: Dict[str, Dict[str, List[int]]] = {facet: defaultdict(list) for facet in FACETS}
+        for position, (genre_ids, kind, rating, status, year) in enumerate(rows):
+            for genre_id in genre_ids or []:
+                positions["genre"][genre_id].append(position)
+            for facet, value in (("kind", kind), ("rating", rating), ("status", status), ("year", year)):
+                if value is not None:
+                    positions[facet][str(value)].append(position)
+
+        self._bitmaps = {
+            facet: {value: _bitmap(value_positions, len(rows)) for value, value_positions in values.items()}
+            for facet, values in positions.items()
+        }
+        self._all = (1 << len(rows)) - 1
+        self._loaded_at = time.monotonic()
+        logger.info(f"Facet index built: {len(rows)} anime in {round(time.perf_counter() - started, 3)}s")
+
+    async def ensure_loaded(self, anime_repository: AnimeRepository):
+        if self.is_fresh():
+            return
+        async with self._lock:
+            if not self.is_fresh():
+                await self.load(anime_repository)
+
+    def _year_mask(self, start_year: Optional[int], end_year: Optional[int]) -> int:
+        mask = 0
+        for year, bitmap in self._bitmaps["year"].items():
+            if (start_year is None or int(year) >= start_year) and (end_year is None or int(year) <= end_year):
+                mask |= bitmap
+        return mask
+
+    def _filter_masks(self, genre_ids: List[str], kind: Optional[str], rating: Optional[str], status: Optional[str], start_year: Optional[int], end_year: Optional[int]) -> Dict[str, int]:
+        """One mask per facet; facets without a selection don't restrict anything."""
+        masks = {facet: self._all for facet in FACETS}
+        for genre_id in genre_ids:
+            masks["genre"] &= self._bitmaps["genre"].get(genre_id, 0)
+        for facet, value in (("kind", kind), ("rating", rating), ("status", status)):
+            if value:
+                masks[facet] = self._bitmaps[facet].get(value, 0)
+        if start_year and end_year:
+            masks["year"] = self._year_mask(start_year, end_year)
+        return masks
+
+    def facet_counts(self, genre_ids: List[str], kind: Optional[str] = None, rating: Optional[str] = None, status: Optional[str] = None, start_year: Optional[int] = None, end_year: Optional[int] = None) -> dict:
+        masks = self._filter_masks(genre_ids, kind, rating, status, start_year, end_year)
+        matched = self._all
+        for mask in masks.values():
+            matched &= mask
+
+        facets = {}
+        for facet in FACETS:
+            # Genres combine with AND, so their counts are refinements of the current result.
+            # Single-value facets are counted without their own selection, so the sidebar
+            # shows how many anime each alternative value would give.
+            base = matched
+            if facet != "genre":
+                base = self._all
+                for other, mask in masks.items():
+                    if other != facet:
+                        base &= mask
+            counts = {value: (base & bitmap).bit_count() for value, bitmap in self._bitmaps[facet].items()}
+            facets[facet] = {value: count for value, count in sorted(counts.items()) if count}
+        return {"total_count": matched.bit_count(), "facets": facets}
+
+
+facet_index = FacetIndex()
+response_cache.on_invalidate(facet_index._on_cache_invalidated)
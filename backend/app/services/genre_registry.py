@@ -0,0 +1,72 @@
+import fnmatch
+import logging
+import time
+from typing import Dict, List, Optional
+
+from app.core.config import Settings
+from app.repositories.genre_repository import GenreRepository
+from app.cache.response_cache import response_cache
+
+logger = logging.getLogger(__name__)
+settings = Settings()
+
+GENRE_CACHE = "genre"
+
+
+class GenreRegistry:
+    """Process-wide in-memory copy of the genre table.
+
+    There are fewer than a hundred genres, so ingestion resolves them from
+    memory and only inserts the unknown ones (one bulk statement per batch).
+    The same snapshot serves the genre endpoints; it is reloaded whenever a new
+    genre is inserted, and after `genre_registry_ttl_seconds` so that genres
+    added by another process show up too.
+    """
+
+    def __init__(self):
+        self._genres: Dict[str, dict] = {}
+        self._loaded_at: Optional[float] = None
+
+    def is_fresh(self) -> bool:
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at < settings.genre_registry_ttl_seconds
+
+    def invalidate(self):
+        self._loaded_at = None
+
+    async def load(self, genre_repository: GenreRepository):
+        genres = await genre_repository.get_genres_list()
+        self._genres = {
+            genre.genre_id: {"id": genre.id, "genre_id": genre.genre_id, "name": genre.name, "russian": genre.russian}
+            for genre in genres
+        }
+        self._loaded_at = time.monotonic()
+
+    async def get_genres(self, genre_repository: GenreRepository) -> List[dict]:
+        if not self.is_fresh():
+            await self.load(genre_repository)
+        return list(self._genres.values())
+
+    async def get_genre(self, genre_repository: GenreRepository, genre_id: str) -> Optional[dict]:
+        if not self.is_fresh():
+            await self.load(genre_repository)
+        return self._genres.get(genre_id)
+
+    async def ensure_genres(self, genre_repository: GenreRepository, genres: List[dict]):
+        """Insert the genres that aren't known yet and refresh the snapshot if anything was new."""
+        if not self.is_fresh():
+            await self.load(genre_repository)
+        new_genres = {genre["genre_id"]: genre for genre in genres if genre["genre_id"] not in self._genres}
+        if not new_genres:
+            return
+        await genre_repository.insert_genres(list(new_genres.values()))
+        logger.info(f"New genres added: {list(new_genres)}")
+        await response_cache.invalidate(GENRE_CACHE)
+        await self.load(genre_repository)
+
+    def _on_cache_invalidated(self, namespace: str):
+        if fnmatch.fnmatchcase(GENRE_CACHE, namespace):
+            self.invalidate()
+
+
+genre_registry = GenreRegistry()
+response_cache.on_invalidate(genre_registry._on_cache_invalidated)
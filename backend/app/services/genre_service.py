@@ -1,5 +1,6 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.repositories.genre_repository import GenreRepository
+from app.services.genre_registry import genre_registry
 from app.core.config import Settings
 import requests
 import json
@@ -14,8 +15,8 @@ class GenreService:
         
     
     async def get_genres_list(self):
-        result = await self.genre_repository.get_genres_list()
+        result = await genre_registry.get_genres(self.genre_repository)
         return result
     
     async def get_genre_by_id(self, genre_id: str):
-        return await self.genre_repository.get_genre_by_id(genre_id)
\ No newline at end of file
+        return await genre_registry.get_genre(self.genre_repository, genre_id)
\ No newline at end of file
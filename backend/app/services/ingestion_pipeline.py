@@ -0,0 +1,190 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+FetchPage = Callable[[int], Awaitable[Optional[list]]]
+WriteBatch = Callable[[List[int], list], Awaitable[None]]
+OnProgress = Callable[["PagePipeline"], Awaitable[None]]
+
+
+class PagePipeline:
+    """Fetch numbered pages concurrently and feed them to a single DB writer.
+
+    Fetchers take page numbers from a shared counter and put parsed pages on a
+    bounded queue; the writer drains the queue and flushes every `batch_pages`
+    pages in one call, so the DB session is only ever used by one coroutine.
+
+    Paging stops at the first empty page (unless `stop_on_empty` is False, for
+    sources with a known page count). A page whose fetch fails (None) is
+    recorded and skipped; after `max_consecutive_failures` failures in a row
+    the run is aborted. `checkpoint` is the highest page up to which every page
+    has been written or given up on, so a later run can resume after it.
+
+    Given-up pages stay in `failed_pages` until they are written: the end of
+    the run retries them (`retry_rounds` times), and `run(retry_pages=...)`
+    carries over the ones an earlier run of the same job left behind.
+    """
+
+    def __init__(
+        self,
+        fetch_page: FetchPage,
+        write_batch: WriteBatch,
+        start_page: int = 1,
+        max_page: int = 2500,
+        concurrency: int = 4,
+        queue_size: int = 10,
+        batch_pages: int = 1,
+        max_consecutive_failures: int = 5,
+        on_progress: Optional[OnProgress] = None,
+        stop_on_empty: bool = True,
+        retry_rounds: int = 1,
+    ):
+        self.fetch_page = fetch_page
+        self.write_batch = write_batch
+        self.start_page = start_page
+        self.max_page = max_page
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.batch_pages = batch_pages
+        self.max_consecutive_failures = max_consecutive_failures
+        self.on_progress = on_progress
+        self.stop_on_empty = stop_on_empty
+        self.retry_rounds = retry_rounds
+
+        self._next_page = start_page
+        self._last_page = max_page
+        self._failure_streak: List[int] = []
+        self._done: Set[int] = set()
+        self._retry_queue: List[int] = []
+        self.checkpoint = start_page - 1
+        self.aborted = False
+        self.pages_written = 0
+        self.items_written = 0
+        self.failed_pages: List[int] = []
+        self.last_error: Optional[str] = None
+
+    def _mark_done(self, pages: List[int]):
+        self._done.update(pages)
+        while self.checkpoint + 1 in self._done:
+            self.checkpoint += 1
+            self._done.remove(self.checkpoint)
+
+    def _stop_after(self, page: int):
+        self._last_page = min(self._last_page, page)
+
+    def _record_failure(self, pages: List[int]):
+        self.failed_pages.extend(page for page in pages if page not in self.failed_pages)
+
+    def _clear_failure(self, pages: List[int]):
+        self.failed_pages = [page for page in self.failed_pages if page not in pages]
+
+    async def _fetcher(self, queue: asyncio.Queue):
+        while self._next_page <= self._last_page:
+            page = self._next_page
+            self._next_page += 1
+
+            items = await self.fetch_page(page)
+            if items is None:
+                self._record_failure([page])
+                self.last_error = f"Page {page} could not be fetched"
+                self._failure_streak.append(page)
+                if len(self._failure_streak) >= self.max_consecutive_failures:
+                    logger.error(f"{len(self._failure_streak)} pages failed in a row, aborting at page {page}")
+                    self.aborted = True
+                    self._stop_after(page - 1)
+                continue
+
+            # A success after failures means the upstream is healthy: give up on the
+            # failed pages so the checkpoint can move past them.
+            self._mark_done(self._failure_streak)
+            self._failure_streak = []
+            if not items:
+                if self.stop_on_empty:
+                    # End of catalogue: don't hand out later pages.
+                    self._stop_after(page - 1)
+                else:
+                    self._mark_done([page])
+                continue
+            await queue.put((page, items))
+
+    async def _retry_fetcher(self, queue: asyncio.Queue):
+        while self._retry_queue:
+            page = self._retry_queue.pop(0)
+            items = await self.fetch_page(page)
+            if items is None:
+                # Still failing: it stays in failed_pages for the next round or run
+                self.last_error = f"Page {page} could not be fetched on retry"
+                continue
+            if not items:
+                # Past the end of the catalogue by now, nothing left to fetch
+                self._clear_failure([page])
+                continue
+            await queue.put((page, items))
+
+    async def _flush(self, pages: List[int], items: list):
+        try:
+            await self.write_batch(pages, items)
+            self.pages_written += len(pages)
+            self.items_written += len(items)
+            self._clear_failure(pages)
+        except Exception as e:
+            logger.error(f"Failed to write pages {pages}: {e}")
+            self._record_failure(pages)
+            self.last_error = f"Pages {pages} could not be written: {e}"
+        self._mark_done(pages)
+        if self.on_progress is not None:
+            try:
+                await self.on_progress(self)
+            except Exception as e:
+                logger.error(f"Progress callback failed: {e}")
+
+    async def _writer(self, queue: asyncio.Queue):
+        pages, items = [], []
+        while True:
+            entry = await queue.get()
+            if entry is None:
+                break
+            page, page_items = entry
+            pages.append(page)
+            items.extend(page_items)
+            if len(pages) >= self.batch_pages:
+                await self._flush(pages, items)
+                pages, items = [], []
+        if pages:
+            await self._flush(pages, items)
+
+    async def _run_pass(self, fetcher):
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        writer = asyncio.create_task(self._writer(queue))
+        fetchers = [asyncio.create_task(fetcher(queue)) for _ in range(self.concurrency)]
+        try:
+            await asyncio.gather(*fetchers)
+        finally:
+            await queue.put(None)
+            await writer
+
+    async def run(self, retry_pages: Optional[List[int]] = None) -> dict:
+        started = time.monotonic()
+        self._record_failure(sorted(retry_pages or []))
+        await self._run_pass(self._fetcher)
+        for _ in range(self.retry_rounds):
+            # An aborted run means the upstream is down; leave the retries to the next run
+            if self.aborted or not self.failed_pages:
+                break
+            logger.info(f"Retrying {len(self.failed_pages)} failed pages")
+            self._retry_queue = sorted(self.failed_pages)
+            await self._run_pass(self._retry_fetcher)
+
+        elapsed = time.monotonic() - started
+        return {
+            "pages_written": self.pages_written,
+            "items_written": self.items_written,
+            "failed_pages": sorted(self.failed_pages),
+            "checkpoint": self.checkpoint,
+            "aborted": self.aborted,
+            "elapsed_seconds": round(elapsed, 2),
+            "items_per_second": round(self.items_written / elapsed, 1) if elapsed else None,
+        }
@@ -1,45 +1,187 @@
-import requests
+import asyncio
+import json
+import logging
+import time
+import httpx
 from bs4 import BeautifulSoup
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from app.core.config import Settings
+from app.db.redis_connection import redis_client
 from app.schemas.news_schemas import NewsBaseSchema
 
+logger = logging.getLogger(__name__)
+settings = Settings()
+
 PAGE_SIZE = 10  # вертає за запит
+NEWS_CACHE_KEY = "news:snapshot"
+NEWS_PAGES = 5
+NEWS_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
+}
 
-async def parse_news() -> List[NewsBaseSchema]:
+# HTML parsing is CPU-bound; run it next to the event loop, not on it
+_parse_executor = ThreadPoolExecutor(max_workers=NEWS_PAGES, thread_name_prefix="news-parse")
+
+
+def _absolute_link(link: str) -> str:
+    return f"https://www.goha.ru{link}" if link.startswith("/") else link
+
+
+def _parse_page(html: str) -> List[NewsBaseSchema]:
     results = []
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
-    }
-
-    for x in range(1, 6):
-        url = f"https://www.goha.ru/anime?page={x}"
-        response = requests.get(url, headers=headers)
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        articles = soup.select(".article-snippet")
-
-        for article in articles:
-            title = article.select_one(".article-snippet__body-title").text.strip()
-            link = article.select_one(".article-snippet__body-title a")["href"]
-            full_link = f"https://www.goha.ru{link}" if link.startswith("/") else link
-            text = article.select_one(".article-snippet__body-shortly-label").text.strip()
-            date = article.select_one("span.article-snippet__body-date-label").text.strip()
-            img = article.select_one(".article-snippet__image-wrapper img")["src"]
-            
-
-            results.append(NewsBaseSchema(
-                title=title,
-                link=full_link,
-                img=img,
-                text=text,
-                date=date
-            ))
+    soup = BeautifulSoup(html, "lxml")
+    for article in soup.select(".article-snippet"):
+        title = article.select_one(".article-snippet__body-title").text.strip()
+        link = article.select_one(".article-snippet__body-title a")["href"]
+        text = article.select_one(".article-snippet__body-shortly-label").text.strip()
+        date = article.select_one("span.article-snippet__body-date-label").text.strip()
+        img = article.select_one(".article-snippet__image-wrapper img")["src"]
 
+        results.append(NewsBaseSchema(
+            title=title,
+            link=_absolute_link(link),
+            img=img,
+            text=text,
+            date=date
+        ))
     return results
 
+
+@dataclass
+class _PageState:
+    """Validators and parsed items of the last successful fetch of one page."""
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    items: List[NewsBaseSchema] = field(default_factory=list)
+
+
+_page_states: Dict[str, _PageState] = {}
+
+
+async def _fetch_page(client: httpx.AsyncClient, url: str) -> List[NewsBaseSchema]:
+    """Fetch one listing page; unchanged pages (304) reuse the items parsed last time."""
+    state = _page_states.get(url)
+    headers = {}
+    if state is not None:
+        if state.etag:
+            headers["If-None-Match"] = state.etag
+        if state.last_modified:
+            headers["If-Modified-Since"] = state.last_modified
+
+    try:
+        response = await client.get(url, headers=headers)
+        if response.status_code == 304 and state is not None:
+            return state.items
+        response.raise_for_status()
+    except httpx.HTTPError as e:
+        if state is not None:
+            logger.warning(f"News page {url} failed ({e}), reusing previous result")
+            return state.items
+        raise
+
+    items = await asyncio.get_running_loop().run_in_executor(_parse_executor, _parse_page, response.text)
+    _page_states[url] = _PageState(
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
+        items=items,
+    )
+    return items
+
+
+async def parse_news() -> List[NewsBaseSchema]:
+    """Fetch all listing pages concurrently; a refresh takes about as long as the slowest page."""
+    urls = [f"https://www.goha.ru/anime?page={x}" for x in range(1, NEWS_PAGES + 1)]
+    async with httpx.AsyncClient(headers=NEWS_HEADERS, timeout=15.0, follow_redirects=True) as client:
+        pages = await asyncio.gather(*(_fetch_page(client, url) for url in urls), return_exceptions=True)
+
+    results = []
+    for url, page in zip(urls, pages):
+        if isinstance(page, Exception):
+            logger.error(f"News page {url} failed: {page}")
+            continue
+        results.extend(page)
+    if not results and pages:
+        raise RuntimeError("All news pages failed")
+    return results
+
+
+class NewsCache:
+    """Snapshot of the scraped news feed, shared through Redis with an in-process copy.
+
+    The worker refreshes the snapshot on a timer; requests only read it. A
+    stale snapshot keeps being served (and refreshed in the background) until
+    a scrape succeeds, so a goha.ru outage never breaks GET /news/.
+    """
+
+    def __init__(self):
+        self._items: Optional[List[NewsBaseSchema]] = None
+        self._fetched_at: float = 0
+        self._checked_at: float = 0
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def _is_stale(self) -> bool:
+        return time.time() - self._fetched_at > settings.news_refresh_minutes * 60
+
+    async def _read_redis(self):
+        try:
+            raw = await redis_client.get_data(NEWS_CACHE_KEY)
+        except Exception as e:
+            logger.warning(f"News cache: Redis read failed: {e}")
+            return
+        if not raw:
+            return
+        snapshot = json.loads(raw)
+        if snapshot["fetched_at"] > self._fetched_at:
+            self._items = [NewsBaseSchema(**item) for item in snapshot["items"]]
+            self._fetched_at = snapshot["fetched_at"]
+
+    async def refresh(self) -> bool:
+        """Scrape the feed and publish it; on failure the previous snapshot stays in place."""
+        try:
+            items = await parse_news()
+        except Exception as e:
+            logger.error(f"News refresh failed, serving stale snapshot: {e}")
+            return False
+        if not items:
+            logger.warning("News refresh returned nothing, keeping previous snapshot")
+            return False
+
+        self._items = items
+        self._fetched_at = time.time()
+        snapshot = {"fetched_at": self._fetched_at, "items": [item.model_dump() for item in items]}
+        try:
+            await redis_client.set_data(NEWS_CACHE_KEY, json.dumps(snapshot, ensure_ascii=False), settings.news_cache_ttl_seconds)
+        except Exception as e:
+            logger.warning(f"News cache: Redis write failed: {e}")
+        return True
+
+    def _refresh_in_background(self):
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self.refresh())
+
+    async def get_items(self) -> List[NewsBaseSchema]:
+        now = time.time()
+        if now - self._checked_at > settings.news_local_ttl_seconds:
+            self._checked_at = now
+            await self._read_redis()
+
+        if self._items is None:
+            # Cold start with nothing cached anywhere: this request has to wait for a scrape
+            self._refresh_in_background()
+            await asyncio.shield(self._refresh_task)
+            return self._items or []
+        if self._is_stale():
+            self._refresh_in_background()
+        return self._items
+
+
+news_cache = NewsCache()
+
  
 async def get_news(page: int = 1) -> List[NewsBaseSchema]:
-    all_news = await parse_news()
+    all_news = await news_cache.get_items()
     start_index = (page - 1) * PAGE_SIZE
     end_index = start_index + PAGE_SIZE
-    return all_news[start_index:end_index]
\ No newline at end of file
+    return all_news[start_index:end_index]
@@ -0,0 +1,81 @@
+import asyncio
+import logging
+import random
+from typing import Optional
+
+import httpx
+
+from app.core.config import Settings
+from app.utils.rate_limiter import TokenBucket
+
+logger = logging.getLogger(__name__)
+settings = Settings()
+
+SHIKIMORI_GRAPHQL_URL = "https://shikimori.one/api/graphql"
+SHIKIMORI_HEADERS = {
+    "User-Agent": "AnimeParser/1.0",
+    "Accept": "application/json",
+    "Content-Type": "application/json",
+}
+# Statuses worth retrying: rate limiting and upstream hiccups
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class ShikimoriClient:
+    """Process-wide async client for the Shikimori GraphQL API.
+
+    All ingestion jobs share one connection pool and one token bucket, so the
+    total request rate stays within Shikimori limits no matter how many pages
+    are fetched concurrently.
+    """
+
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+        self.rate_limiter = TokenBucket(settings.shikimori_rate_limit, settings.shikimori_rate_burst)
+
+    def get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                headers=SHIKIMORI_HEADERS,
+                timeout=settings.shikimori_timeout,
+                limits=httpx.Limits(max_connections=settings.shikimori_concurrency),
+            )
+        return self._client
+
+    async def query(self, query: str) -> Optional[dict]:
+        """Run a GraphQL query and return its `data` object, or None on failure.
+
+        Transport errors, 429 and 5xx responses are retried with exponential
+        backoff (honouring Retry-After); other errors fail immediately.
+        """
+        for attempt in range(settings.shikimori_max_retries + 1):
+            await self.rate_limiter.acquire()
+            delay = settings.shikimori_retry_backoff * 2 ** attempt + random.uniform(0, 0.5)
+            try:
+                response = await self.get_client().post(SHIKIMORI_GRAPHQL_URL, json={"query": query})
+                if response.status_code in RETRY_STATUS_CODES:
+                    retry_after = response.headers.get("Retry-After")
+                    if retry_after and retry_after.isdigit():
+                        delay = max(delay, float(retry_after))
+                    raise httpx.HTTPStatusError(f"Shikimori returned {response.status_code}", request=response.request, response=response)
+                response.raise_for_status()
+                return response.json().get("data")
+            except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                retryable = isinstance(e, httpx.TransportError) or e.response.status_code in RETRY_STATUS_CODES
+                if not retryable or attempt == settings.shikimori_max_retries:
+                    logger.error(f"Shikimori request failed: {e}")
+                    return None
+                logger.warning(f"Shikimori request failed ({e}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+            except (httpx.HTTPError, ValueError) as e:
+                logger.error(f"Shikimori request failed: {e}")
+                return None
+        return None
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+shikimori_client = ShikimoriClient()
@@ -0,0 +1,65 @@
+from typing import List, Optional
+
+# Only what ends up in Anime columns: cheap to fetch and parse, good for frequent syncs
+ANIME_LIGHT_FIELDS = """
+                id
+                english
+                russian
+                japanese
+                synonyms
+                kind
+                rating
+                score
+                status
+                episodes
+                episodesAired
+                duration
+                airedOn { year month day }
+                releasedOn { year month day }
+                season
+                poster { originalUrl }
+                createdAt
+                updatedAt
+                nextEpisodeAt
+                isCensored
+                genres { id name russian }
+                description
+"""
+
+# Relations stored as id/url arrays on Anime; these dominate the payload size
+ANIME_RELATION_FIELDS = """
+                screenshots { originalUrl }
+                related { anime { id } relationText }
+                characterRoles { character { id } }
+"""
+
+ANIME_FIELD_PROFILES = {
+    "light": ANIME_LIGHT_FIELDS,
+    "full": ANIME_LIGHT_FIELDS + ANIME_RELATION_FIELDS,
+}
+
+
+def build_animes_query(
+    page: int = 1,
+    limit: int = 20,
+    profile: str = "full",
+    order: Optional[str] = None,
+    status: Optional[str] = None,
+    ids: Optional[List[str]] = None,
+) -> str:
+    """Build an `animes` GraphQL query selecting the fields of the given profile."""
+    if profile not in ANIME_FIELD_PROFILES:
+        raise ValueError(f"Unknown anime field profile: {profile}")
+
+    args = f"page: {page}, limit: {limit}"
+    if order:
+        args += f", order: {order}"
+    if status:
+        args += f', status: "{status}"'
+    if ids:
+        args += f', ids: "{",".join(ids)}"'
+    return f"""
+        {{
+            animes({args}) {{{ANIME_FIELD_PROFILES[profile]}            }}
+        }}
+        """
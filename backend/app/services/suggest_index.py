@@ -0,0 +1,115 @@
+import asyncio
+import bisect
+import fnmatch
+import heapq
+import logging
+import re
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from app.cache.response_cache import response_cache
+from app.core.config import Settings
+from app.repositories.anime_repository import AnimeRepository
+
+logger = logging.getLogger(__name__)
+settings = Settings()
+
+SUGGEST_FIELDS = ["id", "anime_id", "english", "russian", "poster_url", "score", "kind"]
+# Longer prefixes whose range is wider than this get their top-k memoized on first use
+SUGGEST_MEMOIZE_RANGE = 256
+
+
+def normalize_title(value: str) -> str:
+    value = re.sub(r"[^\w\s]", " ", value.casefold())
+    return " ".join(value.split())
+
+
+class SuggestIndex:
+    """In-memory prefix index over normalized english and russian titles.
+
+    Titles are kept in one sorted list, so the titles starting with a prefix
+    are a contiguous range found with bisect. The top `suggest_top_k` anime by
+    score for every prefix up to `suggest_precomputed_prefix_length`
+    characters (the widest ranges) are precomputed; longer prefixes select
+    their top-k from the range, memoized when the range is wide. Rebuilt lazily after every "anime:*" cache
+    invalidation and after `suggest_index_ttl_seconds`.
+    """
+
+    def __init__(self):
+        self._entries: List[dict] = []
+        self._keys: List[str] = []
+        self._key_entries: List[int] = []
+        self._top: Dict[str, List[int]] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    def is_fresh(self) -> bool:
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at < settings.suggest_index_ttl_seconds
+
+    def invalidate(self):
+        self._loaded_at = None
+
+    def _on_cache_invalidated(self, namespace: str):
+        if fnmatch.fnmatchcase("anime:suggest", namespace):
+            self.invalidate()
+
+    def _score(self, entry_index: int) -> float:
+        return self._entries[entry_index]["score"] or 0
+
+    def _top_k(self, entry_indexes, k: int) -> List[int]:
+        # A title may match by both its english and russian name; keep each anime once
+        return heapq.nlargest(k, set(entry_indexes), key=lambda index: (self._score(index), -index))
+
+    async def load(self, anime_repository: AnimeRepository):
+        started = time.perf_counter()
+        rows = await anime_repository.get_suggest_rows()
+        entries = [dict(zip(SUGGEST_FIELDS, row)) for row in rows]
+        for entry in entries:
+            entry["id"] = str(entry["id"])
+
+        keyed = []
+        for index, entry in enumerate(entries):
+            for title in {normalize_title(entry["english"] or ""), normalize_title(entry["russian"] or "")}:
+                if title:
+                    keyed.append((title, index))
+        keyed.sort()
+
+        self._entries = entries
+        self._keys = [title for title, _ in keyed]
+        self._key_entries = [index for _, index in keyed]
+
+        buckets: Dict[str, List[int]] = defaultdict(list)
+        for title, index in keyed:
+            for length in range(1, min(len(title), settings.suggest_precomputed_prefix_length) + 1):
+                buckets[title[:length]].append(index)
+        self._top = {prefix: self._top_k(indexes, settings.suggest_top_k) for prefix, indexes in buckets.items()}
+
+        self._loaded_at = time.monotonic()
+        logger.info(f"Suggest index built: {len(self._keys)} titles in {round(time.perf_counter() - started, 3)}s")
+
+    async def ensure_loaded(self, anime_repository: AnimeRepository):
+        if self.is_fresh():
+            return
+        async with self._lock:
+            if not self.is_fresh():
+                await self.load(anime_repository)
+
+    def suggest(self, query: str, limit: int) -> List[dict]:
+        prefix = normalize_title(query)
+        if not prefix:
+            return []
+        top = self._top.get(prefix)
+        if top is None:
+            start = bisect.bisect_left(self._keys, prefix)
+            # Every key starting with `prefix` sorts before prefix + the highest code point
+            end = bisect.bisect_left(self._keys, prefix + "\U0010ffff", start)
+            top = self._top_k(self._key_entries[start:end], settings.suggest_top_k)
+            if end - start > SUGGEST_MEMOIZE_RANGE:
+                # Only a few prefixes match this many titles, so remembering them stays small
+                self._top[prefix] = top
+        return [self._entries[index] for index in top[:limit]]
+
+
+suggest_index = SuggestIndex()
+response_cache.on_invalidate(suggest_index._on_cache_invalidated)
@@ -0,0 +1,98 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.repositories.sync_job_repository import SyncJobRepository, SYNC_STATUS_QUEUED, SYNC_STATUS_RUNNING, SYNC_STATUS_COMPLETED, SYNC_STATUS_FAILED
+from app.services.ingestion_pipeline import PagePipeline
+from app.db.models import SyncJob
+from typing import Awaitable, Callable, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+MakePipeline = Callable[[int, Callable[[PagePipeline], Awaitable[None]]], PagePipeline]
+
+
+class SyncJobService:
+
+    def __init__(self, db: AsyncSession):
+        self.sync_job_repository = SyncJobRepository(db)
+
+    @staticmethod
+    def _describe(job: SyncJob) -> dict:
+        """Job fields plus progress, throughput of the current run and ETA."""
+        result = {column.name: getattr(job, column.name) for column in SyncJob.__table__.columns}
+        result["failed_pages"] = job.failed_pages or []
+
+        if job.total_pages:
+            result["progress_percent"] = round(min(job.last_page / job.total_pages, 1) * 100, 1)
+
+        pages_this_run = job.last_page - job.resume_page + 1
+        elapsed = (job.updated_at - job.resumed_at).total_seconds() if job.updated_at and job.resumed_at else 0
+        if pages_this_run > 0 and elapsed > 0:
+            pages_per_second = pages_this_run / elapsed
+            result["pages_per_minute"] = round(pages_per_second * 60, 1)
+            if job.status == SYNC_STATUS_RUNNING and job.total_pages:
+                result["eta_seconds"] = int(max(job.total_pages - job.last_page, 0) / pages_per_second)
+        return result
+
+    async def get_sync_jobs(self, limit: int = 10) -> List[dict]:
+        jobs = await self.sync_job_repository.get_latest_jobs(limit)
+        return [self._describe(job) for job in jobs]
+
+    async def enqueue(self, kind: str, total_pages: Optional[int] = None, params: Optional[dict] = None, resumable: bool = True) -> SyncJob:
+        """Queue a run of `kind` for the worker, which picks queued jobs up (see run_queued_syncs).
+
+        An already queued or running job is returned as is. For a `resumable`
+        kind an interrupted job is queued again, so the run continues from its
+        checkpoint.
+        """
+        job = await self.sync_job_repository.get_resumable_job(kind)
+        if job and job.status in (SYNC_STATUS_QUEUED, SYNC_STATUS_RUNNING):
+            return job
+        if job and resumable:
+            return await self.sync_job_repository.queue_job(job, params)
+        return await self.sync_job_repository.create_job(kind, total_pages, SYNC_STATUS_QUEUED, params)
+
+    async def run_queued(self, job_id, run: Callable[[], Awaitable[dict]]) -> Optional[dict]:
+        """Run a queued job that has no page checkpoint, recording its outcome on the SyncJob."""
+        job = await self.sync_job_repository.get_job(job_id)
+        if job is None or job.status != SYNC_STATUS_QUEUED:
+            return None
+        job = await self.sync_job_repository.resume_job(job)
+        try:
+            result = await run()
+        except Exception as e:
+            logger.error(f"{job.kind} sync {job.id} failed: {e}")
+            await self.sync_job_repository.update_progress(job, job.last_page, job.items_saved, [], str(e))
+            await self.sync_job_repository.finish_job(job, SYNC_STATUS_FAILED)
+            raise
+        await self.sync_job_repository.finish_job(job, SYNC_STATUS_COMPLETED)
+        return result
+
+    async def run_checkpointed(self, kind: str, total_pages: int, make_pipeline: MakePipeline) -> dict:
+        """Run a page pipeline under a SyncJob checkpoint.
+
+        An unfinished job of the same kind is resumed after its last completed
+        page, and the pages it gave up on are retried. The job only completes
+        once no failed pages are left. `make_pipeline(start_page, on_progress)`
+        builds the PagePipeline.
+        """
+        job = await self.sync_job_repository.get_resumable_job(kind)
+        if job:
+            job = await self.sync_job_repository.resume_job(job)
+            logger.info(f"Resuming {kind} sync from page {job.resume_page}")
+        else:
+            job = await self.sync_job_repository.create_job(kind, total_pages)
+            logger.info(f"Starting {kind} sync")
+        items_before = job.items_saved
+
+        async def on_progress(pipeline: PagePipeline):
+            await self.sync_job_repository.update_progress(
+                job, pipeline.checkpoint, items_before + pipeline.items_written, pipeline.failed_pages, pipeline.last_error
+            )
+
+        pipeline = make_pipeline(job.resume_page, on_progress)
+        stats = await pipeline.run(retry_pages=job.failed_pages)
+        await on_progress(pipeline)
+        succeeded = not pipeline.aborted and not pipeline.failed_pages
+        await self.sync_job_repository.finish_job(job, SYNC_STATUS_COMPLETED if succeeded else SYNC_STATUS_FAILED)
+        logger.info(f"{kind} sync finished: {stats}")
+        return {"job_id": job.id, "resume_page": job.last_page + 1, **stats}
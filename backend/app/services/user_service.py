@@ -51,6 +51,11 @@ async def get_current_user_from_token(token: str = Depends(oauth2_scheme), db: A
             raise HTTPException(
                 status_code=401, detail="Token has expired")
         return old_user
+
+async def get_current_admin_from_token(current_user: User = Depends(get_current_user_from_token)) -> User:
+    if current_user.status != UserStatusEnum.ADMIN:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return current_user
 class UserService:
     def __init__(self, db: AsyncSession):
         self.user_repository = UserRepository(db)
@@ -74,8 +79,8 @@ class UserService:
         user = await self.user_repository.get_user_by_id(user_id)
         return user
     
-    async def get_user_by_name(self, name: str) -> dict:
-        users_list = await self.user_repository.get_user_by_name(name)
+    async def get_user_by_name(self, name: str, limit: int = 20, cursor: Optional[str] = None, count: str = "exact") -> dict:
+        users_list = await self.user_repository.get_user_by_name(name, limit, cursor, count)
         return users_list
     
     async def get_user_by_username(self, username: str) -> UserSchema:    
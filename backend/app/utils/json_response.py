@@ -0,0 +1,63 @@
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import Any
+from uuid import UUID
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, the stdlib encoder below produces the same JSON
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    """Types neither encoder knows natively, converted the way jsonable_encoder converts them."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(by_alias=True)
+    if hasattr(value, "_sa_instance_state"):
+        # ORM entity: its loaded attributes, like jsonable_encoder(sqlalchemy_safe=True)
+        return {key: attr for key, attr in vars(value).items() if not key.startswith("_sa")}
+    if isinstance(value, Decimal):
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, bytes):
+        return value.decode()
+    # Only reached without orjson, which serializes these natively
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_default, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: Any) -> Any:
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def to_jsonable(content: Any) -> Any:
+    """`content` as plain JSON data, the same result as jsonable_encoder in one encoder round trip."""
+    return loads(dumps(content))
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson (stdlib json when it is not installed).
+
+    Returning one from an endpoint skips FastAPI's jsonable_encoder pass: rows,
+    ORM entities, datetimes and UUIDs are serialized in a single encoder call.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,187 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import and_, false, func, or_, select, tuple_
+
+from app.cache.response_cache import make_cache_key, response_cache
+from app.core.config import Settings
+
+settings = Settings()
+
+# How a paginated endpoint computes total_count:
+#   exact     - SELECT count(*) over the filtered query
+#   estimated - the planner's row estimate (EXPLAIN), no scan
+#   cached    - exact, but kept in the response cache per filter for cache_ttl_count seconds
+#   none      - no total_count; clients rely on has_more
+COUNT_STRATEGIES = ["exact", "estimated", "cached", "none"]
+
+# Shared descriptions of the pagination query parameters
+CURSOR_DESCRIPTION = "next_cursor from the previous response; switches to keyset pagination and ignores page"
+COUNT_DESCRIPTION = "How total_count is computed: exact, estimated (planner estimate), cached, or none (use has_more)"
+
+# A sort key is (column or expression, descending). The last key must be unique (the primary key),
+# so that (sort keys..., id) totally orders the rows and a cursor pins an exact position.
+SortKey = Tuple[Any, bool]
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, UUID):
+        return {"uuid": str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "uuid" in value:
+            return UUID(value["uuid"])
+    return value
+
+
+def encode_cursor(signature: str, values: Sequence[Any]) -> str:
+    """Opaque cursor for the row with sort key `values` under the ordering named by `signature`."""
+    payload = json.dumps({"s": signature, "v": [_encode_value(value) for value in values]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(signature: str, cursor: str, size: int) -> List[Any]:
+    """Sort key values stored in `cursor`; 400 if it is malformed or was issued for another ordering."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        values = [_decode_value(value) for value in payload["v"]]
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if payload.get("s") != signature or len(values) != size:
+        raise HTTPException(status_code=400, detail="Cursor does not match the requested sorting")
+    return values
+
+
+def order_by_clauses(sort_keys: Sequence[SortKey]) -> list:
+    # NULLS LAST in both directions, so the keyset condition below has one rule for NULLs
+    return [(key.desc() if descending else key.asc()).nulls_last() for key, descending in sort_keys]
+
+
+def _after(key, descending: bool, value, nullable: Optional[bool] = None):
+    if value is None:
+        return false()
+    after = key < value if descending else key > value
+    if nullable is None:
+        nullable = _is_nullable(key)
+    return or_(after, key.is_(None)) if nullable else after
+
+
+def _equal(key, value):
+    return key.is_(None) if value is None else key == value
+
+
+def _is_nullable(key) -> bool:
+    # Mapped columns know whether they are nullable; other expressions may be NULL
+    return getattr(getattr(key, "expression", key), "nullable", True)
+
+
+def _is_seekable(sort_keys: Sequence[SortKey]) -> bool:
+    # (sort_key, id) in one direction: the shape a composite (key, id) index serves
+    return len(sort_keys) == 2 and sort_keys[0][1] == sort_keys[1][1]
+
+
+def keyset_condition(sort_keys: Sequence[SortKey], values: Sequence[Any], nullable: Optional[bool] = None):
+    """WHERE clause selecting the rows strictly after `values` in `order_by_clauses(sort_keys)` order.
+
+    For a seekable (sort_key, id) ordering with a non-null cursor value this
+    covers the non-null rows only; fetch_keyset_page continues into the NULL
+    tail (`sort_key IS NULL`) as a separate query. Whether a key can be NULL is
+    read from its column unless `nullable` says so for all keys; pass False when
+    the query can't return NULL sort keys, so no condition accounts for them.
+    """
+    if len(sort_keys) == 1:
+        key, descending = sort_keys[0]
+        return key < values[0] if descending else key > values[0]
+    if _is_seekable(sort_keys):
+        (key, descending), (id_key, _) = sort_keys
+        value, id_value = values
+        if value is None:
+            # Already in the NULL tail, which is ordered by id alone
+            return and_(key.is_(None), id_key < id_value if descending else id_key > id_value)
+        # (sort_key, id) < (value, id): a plain row comparison the index can seek into.
+        # It never matches NULL keys, so no OR here - that would turn the seek into a scan.
+        row, bound = tuple_(key, id_key), tuple_(value, id_value)
+        return row < bound if descending else row > bound
+    # Mixed directions or several keys: lexicographic expansion
+    clauses = []
+    for i, (key, descending) in enumerate(sort_keys):
+        prefix = [_equal(sort_keys[j][0], values[j]) for j in range(i)]
+        clauses.append(and_(*prefix, _after(key, descending, values[i], nullable)))
+    return or_(*clauses)
+
+
+async def fetch_keyset_page(db, query, sort_keys: Sequence[SortKey], signature: str, limit: int, page: int = 1, cursor: Optional[str] = None, nullable: Optional[bool] = None):
+    """Run `query` ordered by `sort_keys`, one page at a time.
+
+    With a `cursor` the page starts right after the cursor row (keyset
+    pagination, `page` is ignored); without one it falls back to OFFSET.
+    `nullable` says whether the leading sort key can be NULL, i.e. whether a
+    short page has to continue into the NULL tail. By default it is read from
+    the column; pass False for expressions that are never NULL (ranks) and for
+    queries that filter NULL sort keys out.
+    Returns the entities (or row dicts for a column projection) and the cursor
+    of the next page (None on the last page).
+    """
+    # select(Model) yields entities; a column projection yields plain dicts of its columns
+    columns = query.column_descriptions
+    is_entity = len(columns) == 1 and isinstance(columns[0]["expr"], type)
+    names = [column["name"] for column in columns]
+    labels = [key.label(f"_sort_{i}") for i, (key, _) in enumerate(sort_keys)]
+    query = query.add_columns(*labels).order_by(*order_by_clauses(sort_keys))
+    if cursor:
+        values = decode_cursor(signature, cursor, len(sort_keys))
+        rows = (await db.execute(query.where(keyset_condition(sort_keys, values, nullable)).limit(limit + 1))).all()
+        has_null_tail = _is_nullable(sort_keys[0][0]) if nullable is None else nullable
+        if has_null_tail and _is_seekable(sort_keys) and values[0] is not None and len(rows) <= limit:
+            # The non-null rows ran out on this page: fill it from the start of the NULL tail
+            key = sort_keys[0][0]
+            rows += (await db.execute(query.where(key.is_(None)).limit(limit + 1 - len(rows)))).all()
+    else:
+        rows = (await db.execute(query.offset((page - 1) * limit).limit(limit + 1))).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(signature, list(rows[-1][len(names):]))
+    if is_entity:
+        return [row[0] for row in rows], next_cursor
+    return [dict(zip(names, row)) for row in rows], next_cursor
+
+
+async def _exact_count(db, query) -> int:
+    result = await db.execute(select(func.count()).select_from(query.order_by(None).subquery()))
+    return result.scalar()
+
+
+async def _estimated_count(db, query) -> int:
+    connection = await db.connection()
+    sql = query.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True})
+    result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def count_rows(db, query, strategy: str = "exact", cache_namespace: str = "count") -> Optional[int]:
+    """Total rows of the filtered `query` (without pagination) using one of COUNT_STRATEGIES."""
+    if strategy == "none":
+        return None
+    if strategy == "estimated":
+        return await _estimated_count(db, query)
+    if strategy == "cached":
+        sql = str(query.compile(dialect=(await db.connection()).dialect, compile_kwargs={"literal_binds": True}))
+        key = make_cache_key(cache_namespace, {"query": sql})
+        return await response_cache.get_or_compute(key, settings.cache_ttl_count, lambda: _exact_count(db, query))
+    return await _exact_count(db, query)
@@ -0,0 +1,39 @@
+"""Background worker: owns the ingestion scheduler so the web processes never run syncs.
+
+Run with `python -m app.worker`. Any number of workers may run; sync jobs take
+a Postgres advisory lock, so only one of them syncs at a time. Manual syncs
+requested through the API are queued as SyncJob rows and run from here too.
+"""
+import asyncio
+import logging
+import signal
+
+from app.db.postgresql_connection import engine_worker
+from app.db.redis_connection import redis_client
+from app.scheduler.scheduler import scheduler, start_scheduler
+from app.services.shikimori_client import shikimori_client
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def main():
+    await redis_client.connect()
+    start_scheduler()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    logger.info("Worker started")
+    await stop.wait()
+
+    logger.info("Worker shutting down")
+    scheduler.shutdown(wait=False)
+    await shikimori_client.close()
+    await redis_client.close()
+    await engine_worker.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
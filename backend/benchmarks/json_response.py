@@ -0,0 +1,143 @@
+"""Per-response CPU time of JSON serialization on the catalogue paths, before and after.
+
+    cd backend && python -m benchmarks.json_response
+
+Catalogue endpoints go through @cached, so a response is produced on one of
+three paths; the comment listing is not cached:
+
+  miss        service result -> plain JSON data for the cache -> Redis envelope -> response body
+  redis hit   Redis envelope -> plain JSON data -> response body
+  local hit   plain JSON data from the in-process tier -> response body
+  uncached    ORM entities -> response body
+
+"before" is the serialization these paths did with jsonable_encoder and the
+stdlib json module (plus FastAPI's jsonable_encoder pass over the endpoint's
+return value); "after" is the orjson path (to_jsonable, dumps/loads and
+FastJSONResponse), measured once with orjson and once with the stdlib
+fallback. Redis I/O itself is not included.
+"""
+import json
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.db.models import Comment, CommentTypeEnum
+from app.utils import json_response
+from app.utils.json_response import FastJSONResponse, dumps, loads, to_jsonable
+
+ROUNDS = 200
+
+
+def anime_page(size: int) -> dict:
+    # Rows as the "card" projection of the anime list endpoints returns them
+    now = datetime(2024, 1, 1, 12, 30)
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "anime_id": str(50000 + i),
+            "english": f"Anime title {i}",
+            "russian": f"Аніме {i}",
+            "poster_url": f"https://shikimori.one/system/animes/original/{50000 + i}.jpg",
+            "score": 7.5 + (i % 20) / 10,
+            "kind": "tv",
+            "rating": "pg_13",
+            "status": "released",
+            "episodes": 12 + i % 13,
+            "aired_on": now - timedelta(days=30 * i),
+            "genre_ids": [str(g) for g in range(i % 5, i % 5 + 4)],
+            "description": "Опис аніме " * 40,
+        }
+        for i in range(size)
+    ]
+    return {"anime_list": rows, "total_count": 20000, "next_cursor": "eyJzIjoiaWQiLCJ2IjpbMV19", "has_more": True}
+
+
+def comments(size: int) -> list:
+    return [
+        Comment(
+            id=uuid.uuid4(),
+            user_id=uuid.uuid4(),
+            anime_id=uuid.uuid4(),
+            text="Коментар до аніме " * 5,
+            created_at=datetime(2024, 1, 1) + timedelta(minutes=i),
+            updated_at=datetime(2024, 1, 1) + timedelta(minutes=i),
+            likes=i,
+            user_liked_list=[uuid.uuid4() for _ in range(i % 4)],
+            comment_type=CommentTypeEnum.COMMENT,
+            reply_to_comment_id=None,
+            id_of_anime=str(50000 + i),
+        )
+        for i in range(size)
+    ]
+
+
+def envelope(value) -> dict:
+    return {"value": value, "expires_at": time.time() + 600}
+
+
+def miss_before(result) -> bytes:
+    value = jsonable_encoder(result)
+    json.dumps(envelope(value), ensure_ascii=False)
+    return JSONResponse(jsonable_encoder(value)).body
+
+
+def miss_after(result) -> bytes:
+    value = to_jsonable(result)
+    dumps(envelope(value))
+    return FastJSONResponse(value).body
+
+
+def redis_hit_before(raw) -> bytes:
+    value = json.loads(raw)["value"]
+    return JSONResponse(jsonable_encoder(value)).body
+
+
+def redis_hit_after(raw) -> bytes:
+    return FastJSONResponse(loads(raw)["value"]).body
+
+
+def local_hit_before(value) -> bytes:
+    return JSONResponse(jsonable_encoder(value)).body
+
+
+def local_hit_after(value) -> bytes:
+    return FastJSONResponse(value).body
+
+
+def per_response_us(render, content) -> float:
+    render(content)
+    start = time.process_time()
+    for _ in range(ROUNDS):
+        render(content)
+    return (time.process_time() - start) / ROUNDS * 1e6
+
+
+def main():
+    page = anime_page(100)
+    cached_page = jsonable_encoder(page)
+    raw_envelope = json.dumps(envelope(cached_page), ensure_ascii=False)
+    cases = [
+        ("anime page 100 rows, miss", miss_before, miss_after, page),
+        ("anime page 100 rows, redis hit", redis_hit_before, redis_hit_after, raw_envelope),
+        ("anime page 100 rows, local hit", local_hit_before, local_hit_after, cached_page),
+        ("anime page 50 rows, miss", miss_before, miss_after, anime_page(50)),
+        ("comments 100 entities, uncached", local_hit_before, local_hit_after, comments(100)),
+    ]
+    orjson = json_response.orjson
+    print(f"{'path':<36}{'before':>12}{'orjson':>12}{'stdlib':>12}   (us per response)")
+    for name, before, after, content in cases:
+        # Same document either way, only the serialization cost differs
+        assert json.loads(before(content)) == json.loads(after(content))
+        baseline = per_response_us(before, content)
+        fast = per_response_us(after, content)
+        json_response.orjson = None
+        fallback = per_response_us(after, content)
+        json_response.orjson = orjson
+        print(f"{name:<36}{baseline:>12.1f}{fast:>12.1f}{fallback:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -81,7 +81,7 @@ export default function CharacterAnimeList({ characterId }: CharacterAnimeListPr
     <div className='space-y-4'>
       <div className='grid grid-cols-2 sm:grid-cols-3 md:grid-cols-4 lg:grid-cols-5 xl:grid-cols-6 gap-4'>
         {data.anime_list.map((anime: Anime, index: number) => (
-          <AnimeCard key={anime.id} anime={anime} index={index} />
+          <AnimeCard key={anime.anime_id} anime={anime} index={index} />
         ))}
       </div>
     </div>
@@ -215,8 +215,9 @@ const animeService = {
       const encodedQuery = encodeURIComponent(query);
       console.log(`API Call: searchAnime - query: ${query}, page: ${page}, limit: ${limit}`);
       
+      // Сервер сам отдаёт нужную страницу и общее количество результатов
       const response = await axios.get<AnimeListResponse>(
-        `${API_URL}/anime/name/${encodedQuery}`
+        `${API_URL}/anime/name/${encodedQuery}?page=${page}&limit=${limit}`
       );
       
       // Проверяем, что ответ содержит ожидаемые данные
@@ -225,39 +226,9 @@ const animeService = {
         throw new Error('Неверный формат ответа от API');
       }
       
-      // Всегда применяем клиентскую пагинацию для результатов поиска
-      console.log(`API вернул ${response.data.anime_list.length} результатов. Применяем клиентскую пагинацию.`);
-      
-      // Сохраняем общее количество для пагинации
-      const totalCount = response.data.total_count || response.data.anime_list.length;
-      
-      // Вычисляем индексы для текущей страницы
-      const startIndex = (page - 1) * limit;
-      const endIndex = startIndex + limit;
-      
-      // Проверяем, что у нас есть результаты для текущей страницы
-      if (startIndex >= response.data.anime_list.length) {
-        // Если запрошенная страница выходит за пределы доступных результатов,
-        // возвращаем последнюю доступную страницу
-        const lastPage = Math.ceil(response.data.anime_list.length / limit);
-        const newStartIndex = (lastPage - 1) * limit;
-        const newEndIndex = Math.min(newStartIndex + limit, response.data.anime_list.length);
-        
-        return {
-          anime_list: response.data.anime_list.slice(newStartIndex, newEndIndex),
-          total_count: totalCount,
-          limit: limit,
-          page: lastPage
-        };
-      }
-      
-      // Получаем подмножество результатов для текущей страницы
-      const paginatedResults = response.data.anime_list.slice(startIndex, endIndex);
-      
-      // Возвращаем пагинированные результаты
       return {
-        anime_list: paginatedResults,
-        total_count: totalCount,
+        anime_list: response.data.anime_list,
+        total_count: response.data.total_count ?? response.data.anime_list.length,
         limit: limit,
         page: page
       };
@@ -63,7 +63,8 @@ const characterService = {
     try {
       console.log(`API Call: getAnimeByCharacterId - characterId: ${characterId}`);
       // Используем поиск по всем аниме и фильтруем на клиенте
-      const response = await axios.get(`${API_URL}/anime/get-anime-list?page=1&limit=100`);
+      // Список отдаёт только поля карточки, character_ids нужно запросить явно
+      const response = await axios.get(`${API_URL}/anime/get-anime-list?page=1&limit=100&fields=card,character_ids`);
       
       // Фильтруем аниме, которые содержат данного персонажа
       const animeWithCharacter = response.data.anime_list.filter((anime: Anime) => 